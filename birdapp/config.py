@@ -2,7 +2,7 @@ import getpass
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 def get_config_path() -> Path:
     """Get the path to the user-level config file."""
@@ -136,7 +136,16 @@ def ensure_profile(username: str) -> None:
 
 def get_credential(key: str, profile: str | None = None) -> Optional[str]:
     """Get a credential from the config file."""
+    return _lookup_credential(load_config(), key, profile)
+
+
+def get_credentials(keys: Iterable[str], profile: str | None = None) -> Dict[str, Optional[str]]:
+    """Get several credentials with a single read of the config file."""
     config = load_config()
+    return {key: _lookup_credential(config, key, profile) for key in keys}
+
+
+def _lookup_credential(config: Dict[str, Any], key: str, profile: str | None) -> Optional[str]:
     profiles = _get_profiles(config)
     oauth2_app = _get_oauth2_app_config(config)
     if profiles:
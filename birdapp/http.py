@@ -0,0 +1,29 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One process-wide session so every X API call (tweets, media upload, user
+# lookups, OAuth2 token endpoints) reuses pooled keep-alive connections.
+_session: requests.Session | None = None
+
+# Transient upstream failures are retried for idempotent methods only: a POST
+# that creates a tweet or uploads media must never be replayed implicitly.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    raise_on_status=False,
+)
+
+
+def get_session() -> requests.Session:
+    """Return the shared `requests.Session`, creating it on first use."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=_RETRY)
+        session.mount("https://api.x.com", adapter)
+        session.mount("https://upload.twitter.com", adapter)
+        _session = session
+    return _session
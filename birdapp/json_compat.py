@@ -0,0 +1,76 @@
+"""
+JSON encode/decode helpers that use orjson when it is installed.
+
+orjson is an optional speedup (`pip install birdapp[speedups]`); without it
+these fall back to the standard library with matching semantics.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    """Serialize `value` to a compact JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            # orjson rejects a few inputs stdlib accepts (non-str keys,
+            # integers wider than 64 bits); keep those working.
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from `str` or `bytes`."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(value: Any, *, indent: bool = False) -> bytes:
+    """
+    Serialize `value` to UTF-8 JSON bytes.
+
+    With `indent=True` the output is indented by two spaces and ends with a
+    newline, for files meant to be read or diffed by people.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE if indent else 0
+        try:
+            return orjson.dumps(value, option=option)
+        except TypeError:
+            pass
+    if indent:
+        return (json.dumps(value, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_file(path: str, value: Any, *, indent: bool = False) -> None:
+    """
+    Atomically replace the file at `path` with `value` encoded as JSON.
+
+    The document is written to a private temporary file in the same directory
+    and moved into place with `os.replace`, so readers never observe a
+    half-written file and a crash leaves the previous contents intact.
+    """
+    data = dumps_bytes(value, indent=indent)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -1,9 +1,10 @@
 import argparse
 import json
 import os
+from collections.abc import Callable
 from datetime import date, datetime, timezone
 
-from .tweet import post_tweet, get_tweets_by_ids
+from .tweet import post_tweet, get_tweets_by_ids_many
 from .config import (
     clear_profile_override,
     get_active_profile,
@@ -27,7 +28,7 @@ from .storage.embeddings import (
     semantic_search_tweets_in_db,
 )
 from .storage.importer import import_archive
-from .storage.search import search_results_payload, search_tweets_in_db
+from .storage.search import search_tweets_in_db, search_tweets_payload_in_db
 from .user import (
     get_user_by_id, get_users_by_ids,
     get_user_by_username, get_users_by_usernames,
@@ -93,6 +94,344 @@ def _format_tweet_url(username: str, tweet_id: str) -> str:
     return f"https://x.com/{username}/status/{tweet_id}"
 
 
+def _run_profile(args: argparse.Namespace) -> None:
+    """Handle the ``profile`` subcommands."""
+    if args.profile_command == "use":
+        if not has_profile(args.username):
+            print(f"Profile '{args.username}' not found. Run `birdapp auth config` to create it.")
+            return
+        set_active_profile(args.username)
+        print(f"Active profile set to {args.username}")
+        return
+    if args.profile_command == "list":
+        profiles = list_profiles()
+        if not profiles:
+            print("No profiles found. Run `birdapp auth config` to create one.")
+            return
+        active = get_active_profile()
+        for profile in profiles:
+            marker = "*" if active == profile else " "
+            print(f"{marker} {profile}")
+        return
+    if args.profile_command == "show":
+        show_config(profile=args.username)
+        return
+
+
+def _run_auth(args: argparse.Namespace) -> None:
+    """Handle the ``auth`` subcommands."""
+    profile: str | None = getattr(args, "profile", None)
+    if args.auth_command == "config":
+        if args.show:
+            show_config(profile=profile)
+        elif args.oauth1:
+            prompt_for_credentials(profile=profile)
+        elif args.oauth2:
+            prompt_for_oauth2_credentials(profile=profile)
+        else:
+            flow = _prompt_for_auth_flow()
+            if flow == "oauth1":
+                prompt_for_credentials(profile=profile)
+            else:
+                prompt_for_oauth2_credentials(profile=profile)
+    elif args.auth_command == "login":
+        if not _has_oauth2_config():
+            if _has_oauth1_credentials():
+                print("OAuth1 credentials are configured; no login step is required.")
+            else:
+                print("OAuth2 credentials are not configured. Run `birdapp auth config`.")
+            return
+
+        try:
+            result = oauth2_login_flow(profile=profile)
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                print(json.dumps(result, indent=2))
+        except Exception as e:
+            print(f"❌ Error during OAuth2 flow: {str(e)}")
+    else:
+        try:
+            result = oauth2_whoami(args.user_id, profile=profile)
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                print(json.dumps(result, indent=2))
+        except Exception as e:
+            print(f"❌ Error during OAuth2 flow: {str(e)}")
+
+
+def _run_tweet(args: argparse.Namespace) -> None:
+    """Post a tweet."""
+    profile: str | None = getattr(args, "profile", None)
+    if args.text_flag is not None and args.text is not None:
+        print("Error: Provide tweet text either positionally or with --text, not both")
+        raise SystemExit(1)
+
+    text = (args.text_flag or args.text or "").strip()
+
+    # Validate arguments
+    if not text and not args.media:
+        print("Error: Cannot post empty tweet without media")
+        exit(1)
+
+    if _has_oauth2_config() and not has_oauth2_token(profile=profile) and not _has_oauth1_credentials():
+        profile_hint = f"--profile {profile} " if profile else ""
+        print(
+            "No OAuth2 login token is stored for this profile. "
+            f"Run `birdapp {profile_hint}auth login` to complete OAuth2 login."
+        )
+        return
+
+    # Post the tweet
+    try:
+        success, message = post_tweet(
+            text=text,
+            media_path=args.media,
+            reply_to=args.reply_to
+        )
+
+        if success:
+            print(f"✅ Successfully posted tweet: {message}")
+        else:
+            print(f"❌ Failed to post tweet: {message}")
+
+    except Exception as e:
+        print(f"❌ Error posting tweet: {str(e)}")
+
+
+def _run_get(args: argparse.Namespace) -> None:
+    """Look up tweets by id."""
+    try:
+        success, result = get_tweets_by_ids_many(args.ids)
+
+        if success:
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                if isinstance(result, dict):
+                    format_tweets_output(result, args.format)
+                else:
+                    print(f"❌ Failed to get tweets: {result}")
+        else:
+            print(f"❌ Failed to get tweets: {result}")
+
+    except Exception as e:
+        print(f"❌ Error getting tweets: {str(e)}")
+
+
+def _run_user(args: argparse.Namespace) -> None:
+    """Look up users by id or username."""
+    try:
+        # Determine if we're looking up by ID or username
+        identifiers = args.identifiers
+
+        # Auto-detect type if not forced
+        if not args.by_id and not args.by_username:
+            # Check if all identifiers look like IDs (all digits) or usernames
+            all_digits = all(ident.isdigit() for ident in identifiers)
+            if all_digits:
+                by_id = True
+            else:
+                by_id = False
+        else:
+            by_id = args.by_id
+
+        # Perform the lookup
+        if len(identifiers) == 1:
+            # Single user lookup
+            if by_id:
+                success, result = get_user_by_id(
+                    identifiers[0],
+                    user_fields=args.fields,
+                    expansions=args.expansions,
+                    tweet_fields=args.tweet_fields
+                )
+            else:
+                success, result = get_user_by_username(
+                    identifiers[0],
+                    user_fields=args.fields,
+                    expansions=args.expansions,
+                    tweet_fields=args.tweet_fields
+                )
+        else:
+            # Multiple users lookup
+            if by_id:
+                success, result = get_users_by_ids(
+                    identifiers,
+                    user_fields=args.fields,
+                    expansions=args.expansions,
+                    tweet_fields=args.tweet_fields
+                )
+            else:
+                success, result = get_users_by_usernames(
+                    identifiers,
+                    user_fields=args.fields,
+                    expansions=args.expansions,
+                    tweet_fields=args.tweet_fields
+                )
+
+        if success:
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                if isinstance(result, dict):
+                    format_users_output(result, args.format)
+                else:
+                    print(f"❌ Failed to get user(s): {result}")
+        else:
+            print(f"❌ Failed to get user(s): {result}")
+
+    except Exception as e:
+        print(f"❌ Error getting user(s): {str(e)}")
+
+
+def _run_import_archive(args: argparse.Namespace) -> None:
+    """Import a community archive into the local database."""
+    try:
+        username = args.username
+        if not username and not args.url and not args.path:
+            username = get_credential("X_USERNAME")
+        result = import_archive(
+            args.db,
+            username=username,
+            url=args.url,
+            path=args.path,
+            batch_size=args.batch_size,
+            workers=args.workers,
+        )
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            total = sum(result.values())
+            print(f"✅ Imported {total} rows")
+            for key, value in result.items():
+                print(f"{key}: {value}")
+        if args.embed:
+            embedded = embed_tweets_in_db(
+                args.db,
+                model_override=None,
+                batch_size=args.batch_size,
+            )
+            print(f"✅ Embedded {embedded} tweets")
+    except Exception as e:
+        print(f"❌ Error importing archive: {str(e)}")
+
+
+def _run_search(args: argparse.Namespace) -> None:
+    """Search tweets stored in the local database."""
+    try:
+        since = _parse_date(args.since, flag="--since")
+        until = _parse_date(args.until, flag="--until")
+        if args.semantic:
+            results = semantic_search_tweets_in_db(
+                args.db,
+                query=args.query,
+                author=args.author,
+                since=since,
+                until=until,
+                limit=args.limit,
+                model_override=None,
+            )
+            if args.json:
+                print(json.dumps(semantic_results_payload(results), indent=2))
+            else:
+                if not results:
+                    print("No results found.")
+                    return
+                for result in results:
+                    created_at = _format_search_timestamp(result.created_at)
+                    print(f"Tweet ID: {result.tweet_id}")
+                    print(
+                        "Owner: "
+                        f"@{result.owner_username} "
+                        f"({result.owner_display_name})"
+                    )
+                    print(f"Created: {created_at}")
+                    if args.include_url:
+                        url = _format_tweet_url(result.owner_username, result.tweet_id)
+                        print(f"URL: {url}")
+                    print(f"Text: {result.full_text}")
+                    print("-" * 50)
+        elif args.json:
+            # Rows are serialized directly; no SearchResult objects are built.
+            payload = search_tweets_payload_in_db(
+                args.db,
+                query=args.query,
+                author=args.author,
+                since=since,
+                until=until,
+                limit=args.limit,
+            )
+            print(json.dumps(payload, indent=2))
+        else:
+            results = search_tweets_in_db(
+                args.db,
+                query=args.query,
+                author=args.author,
+                since=since,
+                until=until,
+                limit=args.limit,
+            )
+            if not results:
+                print("No results found.")
+                return
+            for result in results:
+                created_at = _format_search_timestamp(result.created_at)
+                print(f"Tweet ID: {result.tweet_id}")
+                print(
+                    "Owner: "
+                    f"@{result.owner.username} "
+                    f"({result.owner.account_display_name})"
+                )
+                print(f"Created: {created_at}")
+                if args.include_url:
+                    url = _format_tweet_url(result.owner.username, result.tweet_id)
+                    print(f"URL: {url}")
+                print(f"Text: {result.full_text}")
+                print("-" * 50)
+    except Exception as e:
+        if isinstance(e, EmbeddingsUnavailable):
+            print(str(e))
+        else:
+            print(f"❌ Error searching tweets: {str(e)}")
+
+
+def _run_embed(args: argparse.Namespace) -> None:
+    """Generate embeddings or configure embedding credentials."""
+    if args.embed_command == "config":
+        if args.show:
+            show_embedding_config()
+            return
+        if not args.api_key:
+            print("OPENAI_API_KEY is required.")
+            return
+        set_embedding_credentials(api_key=args.api_key, model=args.model)
+        print("✅ Embedding configuration saved.")
+        return
+    try:
+        embedded = embed_tweets_in_db(
+            args.db,
+            model_override=args.model,
+            batch_size=args.batch_size,
+        )
+        print(f"✅ Embedded {embedded} tweets")
+    except Exception as e:
+        print(f"❌ Error generating embeddings: {str(e)}")
+
+
+COMMANDS: dict[str, Callable[[argparse.Namespace], None]] = {
+    "profile": _run_profile,
+    "auth": _run_auth,
+    "tweet": _run_tweet,
+    "get": _run_get,
+    "user": _run_user,
+    "import-archive": _run_import_archive,
+    "search": _run_search,
+    "embed": _run_embed,
+}
+
+
 def main() -> None:
     """Main CLI entry point"""
     common_parser = argparse.ArgumentParser(add_help=False)
@@ -197,7 +536,7 @@ def main() -> None:
         help="Get tweets by ID",
         parents=[common_parser],
     )
-    get_parser.add_argument('ids', nargs='+', help='Tweet IDs to retrieve (space separated)')
+    get_parser.add_argument('ids', nargs='+', help='Tweet IDs to retrieve (space separated; fetched 100 per request)')
     get_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
     get_parser.add_argument('--format', choices=['simple', 'detailed'], default='simple', 
                            help='Output format (simple or detailed)')
@@ -246,6 +585,12 @@ def main() -> None:
         default=1000,
         help='Batch size for inserts (default: 1000)',
     )
+    import_parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes used to normalize tweets before writing (default: 1)',
+    )
     import_parser.add_argument('--json', action='store_true', help='Output raw JSON result')
     import_parser.add_argument(
         "--embed",
@@ -335,317 +680,9 @@ def main() -> None:
         set_profile_override(profile)
     else:
         clear_profile_override()
-    
-    # Handle profile command
-    if args.command == "profile":
-        if args.profile_command == "use":
-            if not has_profile(args.username):
-                print(f"Profile '{args.username}' not found. Run `birdapp auth config` to create it.")
-                return
-            set_active_profile(args.username)
-            print(f"Active profile set to {args.username}")
-            return
-        if args.profile_command == "list":
-            profiles = list_profiles()
-            if not profiles:
-                print("No profiles found. Run `birdapp auth config` to create one.")
-                return
-            active = get_active_profile()
-            for profile in profiles:
-                marker = "*" if active == profile else " "
-                print(f"{marker} {profile}")
-            return
-        if args.profile_command == "show":
-            show_config(profile=args.username)
-            return
-
-    # Handle auth command
-    if args.command == "auth":
-        if args.auth_command == "config":
-            if args.show:
-                show_config(profile=profile)
-            elif args.oauth1:
-                prompt_for_credentials(profile=profile)
-            elif args.oauth2:
-                prompt_for_oauth2_credentials(profile=profile)
-            else:
-                flow = _prompt_for_auth_flow()
-                if flow == "oauth1":
-                    prompt_for_credentials(profile=profile)
-                else:
-                    prompt_for_oauth2_credentials(profile=profile)
-        elif args.auth_command == "login":
-            if not _has_oauth2_config():
-                if _has_oauth1_credentials():
-                    print("OAuth1 credentials are configured; no login step is required.")
-                else:
-                    print("OAuth2 credentials are not configured. Run `birdapp auth config`.")
-                return
-
-            try:
-                result = oauth2_login_flow(profile=profile)
-                if args.json:
-                    print(json.dumps(result, indent=2))
-                else:
-                    print(json.dumps(result, indent=2))
-            except Exception as e:
-                print(f"❌ Error during OAuth2 flow: {str(e)}")
-        else:
-            try:
-                result = oauth2_whoami(args.user_id, profile=profile)
-                if args.json:
-                    print(json.dumps(result, indent=2))
-                else:
-                    print(json.dumps(result, indent=2))
-            except Exception as e:
-                print(f"❌ Error during OAuth2 flow: {str(e)}")
-        return
-    
-    # Handle tweet command
-    if args.command == 'tweet':
-        if args.text_flag is not None and args.text is not None:
-            print("Error: Provide tweet text either positionally or with --text, not both")
-            raise SystemExit(1)
-
-        text = (args.text_flag or args.text or "").strip()
-
-        # Validate arguments
-        if not text and not args.media:
-            print("Error: Cannot post empty tweet without media")
-            exit(1)
-
-        if _has_oauth2_config() and not has_oauth2_token(profile=profile) and not _has_oauth1_credentials():
-            profile_hint = f"--profile {profile} " if profile else ""
-            print(
-                "No OAuth2 login token is stored for this profile. "
-                f"Run `birdapp {profile_hint}auth login` to complete OAuth2 login."
-            )
-            return
-        
-        # Post the tweet
-        try:
-            success, message = post_tweet(
-                text=text,
-                media_path=args.media,
-                reply_to=args.reply_to
-            )
-            
-            if success:
-                print(f"✅ Successfully posted tweet: {message}")
-            else:
-                print(f"❌ Failed to post tweet: {message}")
-                
-        except Exception as e:
-            print(f"❌ Error posting tweet: {str(e)}")
-    
-    # Handle get command
-    if args.command == 'get':
-        try:
-            success, result = get_tweets_by_ids(args.ids)
-            
-            if success:
-                if args.json:
-                    print(json.dumps(result, indent=2))
-                else:
-                    if isinstance(result, dict):
-                        format_tweets_output(result, args.format)
-                    else:
-                        print(f"❌ Failed to get tweets: {result}")
-            else:
-                print(f"❌ Failed to get tweets: {result}")
-                
-        except Exception as e:
-            print(f"❌ Error getting tweets: {str(e)}")
-    
-    # Handle user command
-    if args.command == 'user':
-        try:
-            # Determine if we're looking up by ID or username
-            identifiers = args.identifiers
-            
-            # Auto-detect type if not forced
-            if not args.by_id and not args.by_username:
-                # Check if all identifiers look like IDs (all digits) or usernames
-                all_digits = all(ident.isdigit() for ident in identifiers)
-                if all_digits:
-                    by_id = True
-                else:
-                    by_id = False
-            else:
-                by_id = args.by_id
-            
-            # Perform the lookup
-            if len(identifiers) == 1:
-                # Single user lookup
-                if by_id:
-                    success, result = get_user_by_id(
-                        identifiers[0],
-                        user_fields=args.fields,
-                        expansions=args.expansions,
-                        tweet_fields=args.tweet_fields
-                    )
-                else:
-                    success, result = get_user_by_username(
-                        identifiers[0],
-                        user_fields=args.fields,
-                        expansions=args.expansions,
-                        tweet_fields=args.tweet_fields
-                    )
-            else:
-                # Multiple users lookup
-                if by_id:
-                    success, result = get_users_by_ids(
-                        identifiers,
-                        user_fields=args.fields,
-                        expansions=args.expansions,
-                        tweet_fields=args.tweet_fields
-                    )
-                else:
-                    success, result = get_users_by_usernames(
-                        identifiers,
-                        user_fields=args.fields,
-                        expansions=args.expansions,
-                        tweet_fields=args.tweet_fields
-                    )
-            
-            if success:
-                if args.json:
-                    print(json.dumps(result, indent=2))
-                else:
-                    if isinstance(result, dict):
-                        format_users_output(result, args.format)
-                    else:
-                        print(f"❌ Failed to get user(s): {result}")
-            else:
-                print(f"❌ Failed to get user(s): {result}")
-                
-        except Exception as e:
-            print(f"❌ Error getting user(s): {str(e)}")
 
-    # Handle import-archive command
-    if args.command == 'import-archive':
-        try:
-            username = args.username
-            if not username and not args.url and not args.path:
-                username = get_credential("X_USERNAME")
-            result = import_archive(
-                args.db,
-                username=username,
-                url=args.url,
-                path=args.path,
-                batch_size=args.batch_size,
-            )
-            if args.json:
-                print(json.dumps(result, indent=2))
-            else:
-                total = sum(result.values())
-                print(f"✅ Imported {total} rows")
-                for key, value in result.items():
-                    print(f"{key}: {value}")
-            if args.embed:
-                embedded = embed_tweets_in_db(
-                    args.db,
-                    model_override=None,
-                    batch_size=args.batch_size,
-                )
-                print(f"✅ Embedded {embedded} tweets")
-        except Exception as e:
-            print(f"❌ Error importing archive: {str(e)}")
-        return
-
-    # Handle search command
-    if args.command == "search":
-        try:
-            since = _parse_date(args.since, flag="--since")
-            until = _parse_date(args.until, flag="--until")
-            if args.semantic:
-                results = semantic_search_tweets_in_db(
-                    args.db,
-                    query=args.query,
-                    author=args.author,
-                    since=since,
-                    until=until,
-                    limit=args.limit,
-                    model_override=None,
-                )
-                if args.json:
-                    print(json.dumps(semantic_results_payload(results), indent=2))
-                else:
-                    if not results:
-                        print("No results found.")
-                        return
-                    for result in results:
-                        created_at = _format_search_timestamp(result.created_at)
-                        print(f"Tweet ID: {result.tweet_id}")
-                        print(
-                            "Owner: "
-                            f"@{result.owner_username} "
-                            f"({result.owner_display_name})"
-                        )
-                        print(f"Created: {created_at}")
-                        if args.include_url:
-                            url = _format_tweet_url(result.owner_username, result.tweet_id)
-                            print(f"URL: {url}")
-                        print(f"Text: {result.full_text}")
-                        print("-" * 50)
-            else:
-                results = search_tweets_in_db(
-                    args.db,
-                    query=args.query,
-                    author=args.author,
-                    since=since,
-                    until=until,
-                    limit=args.limit,
-                )
-                if args.json:
-                    print(json.dumps(search_results_payload(results), indent=2))
-                else:
-                    if not results:
-                        print("No results found.")
-                        return
-                    for result in results:
-                        created_at = _format_search_timestamp(result.created_at)
-                        print(f"Tweet ID: {result.tweet_id}")
-                        print(
-                            "Owner: "
-                            f"@{result.owner.username} "
-                            f"({result.owner.account_display_name})"
-                        )
-                        print(f"Created: {created_at}")
-                        if args.include_url:
-                            url = _format_tweet_url(result.owner.username, result.tweet_id)
-                            print(f"URL: {url}")
-                        print(f"Text: {result.full_text}")
-                        print("-" * 50)
-        except Exception as e:
-            if isinstance(e, EmbeddingsUnavailable):
-                print(str(e))
-            else:
-                print(f"❌ Error searching tweets: {str(e)}")
-        return
+    COMMANDS[args.command](args)
 
-    # Handle embed command
-    if args.command == "embed":
-        if args.embed_command == "config":
-            if args.show:
-                show_embedding_config()
-                return
-            if not args.api_key:
-                print("OPENAI_API_KEY is required.")
-                return
-            set_embedding_credentials(api_key=args.api_key, model=args.model)
-            print("✅ Embedding configuration saved.")
-            return
-        try:
-            embedded = embed_tweets_in_db(
-                args.db,
-                model_override=args.model,
-                batch_size=args.batch_size,
-            )
-            print(f"✅ Embedded {embedded} tweets")
-        except Exception as e:
-            print(f"❌ Error generating embeddings: {str(e)}")
-        return
 
 def format_tweets_output(data: dict, format_type: str):
     """Format and display tweet data"""
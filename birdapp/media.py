@@ -1,6 +1,6 @@
 import logging
-import requests
 from .auth import create_oauth1_auth
+from .http import get_session
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -16,7 +16,7 @@ def create_media_payload(path: str | None) -> dict[str, dict[str, list[str]]]:
         with open(path, "rb") as file:
             files = {"media": file}
             logger.info(f"Uploading media to {upload_url}")
-            response = requests.post(upload_url, auth=auth, files=files)
+            response = get_session().post(upload_url, auth=auth, files=files)
             response.raise_for_status()
             media_id = response.json().get("media_id_string")
             if media_id:
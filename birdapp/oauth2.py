@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 import base64
+import binascii
 import hashlib
 import json
 import os
 import secrets
-import threading
+import time
+from functools import lru_cache
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import Any, Mapping, NotRequired, Sequence, TypedDict
-from urllib.parse import parse_qs, quote, urlencode, urlparse
-
-import requests
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
 
+from . import json_compat
 from .config import ensure_profile, get_active_profile, get_credential
+from .http import get_session
 
 OAUTH2_AUTHORIZE_URL = "https://x.com/i/oauth2/authorize"
 OAUTH2_TOKEN_URL = "https://api.x.com/2/oauth2/token"
@@ -21,43 +23,64 @@ DEFAULT_FIXTURES_DIR = os.path.join("tests", "fixtures")
 DEFAULT_OAUTH2_SCOPES = "tweet.read tweet.write users.read offline.access"
 
 
-def wait_for_oauth_callback(redirect_uri: str, timeout_seconds: int = 180) -> dict[str, Any]:
-    """Start local HTTP server and wait for OAuth2 callback."""
-    parsed = urlparse(redirect_uri)
+class _OAuthCallbackServer(HTTPServer):
+    """Single-shot callback server; holds the state its handler fills in."""
+
+    def __init__(self, address: tuple[str, int], expected_path: str, deadline: float) -> None:
+        super().__init__(address, _OAuthCallbackHandler)
+        self.expected_path = expected_path
+        self.deadline = deadline
+        self.params: dict[str, str] | None = None
+
+
+class _OAuthCallbackHandler(BaseHTTPRequestHandler):
+    server: _OAuthCallbackServer
+
+    def setup(self) -> None:
+        # Reads on an accepted connection are bounded by the login deadline
+        # too, so a socket that never sends a request line (e.g. a browser
+        # preconnect) cannot hold the wait open.
+        super().setup()
+        self.connection.settimeout(max(self.server.deadline - time.monotonic(), 0.01))
+
+    def do_GET(self) -> None:
+        request_url = urlsplit(self.path)
+        if request_url.path != self.server.expected_path:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.server.params = dict(parse_qsl(request_url.query))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(b"OAuth2 callback received. You can close this tab.")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+
+def wait_for_oauth_callback(redirect_uri: str, timeout_seconds: int = 180) -> dict[str, str]:
+    """Start local HTTP server and wait for OAuth2 callback; returns its query parameters."""
+    parsed = urlsplit(redirect_uri)
     host = parsed.hostname or "127.0.0.1"
     port = parsed.port or (443 if parsed.scheme == "https" else 80)
-    expected_path = parsed.path or "/"
-    event = threading.Event()
-    result: dict[str, Any] = {}
-
-    def handler_factory() -> type[BaseHTTPRequestHandler]:
-        class OAuthCallbackHandler(BaseHTTPRequestHandler):
-            def do_GET(self) -> None:
-                request_path = urlparse(self.path).path
-                if request_path != expected_path:
-                    self.send_response(404)
-                    self.end_headers()
-                    return
-                params = parse_qs(urlparse(self.path).query)
-                result.update(params)
-                self.send_response(200)
-                self.send_header("Content-Type", "text/plain; charset=utf-8")
-                self.end_headers()
-                self.wfile.write(b"OAuth2 callback received. You can close this tab.")
-                event.set()
-                threading.Thread(target=self.server.shutdown, daemon=True).start()
-
-            def log_message(self, format: str, *args: Any) -> None:
-                return
-
-        return OAuthCallbackHandler
-
-    server = HTTPServer((host, port), handler_factory())
-    threading.Thread(target=server.serve_forever, daemon=True).start()
-    if not event.wait(timeout_seconds):
-        server.shutdown()
-        raise RuntimeError("Timed out waiting for OAuth2 callback")
-    return result
+
+    # Serve one request at a time on this thread until the callback arrives;
+    # stray requests (favicon, wrong path) just consume part of the timeout.
+    deadline = time.monotonic() + timeout_seconds
+    server = _OAuthCallbackServer(
+        (host, port), expected_path=parsed.path or "/", deadline=deadline
+    )
+    try:
+        while server.params is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("Timed out waiting for OAuth2 callback")
+            server.timeout = remaining
+            server.handle_request()
+    finally:
+        server.server_close()
+    return server.params
 
 
 class Token(TypedDict):
@@ -67,12 +90,20 @@ class Token(TypedDict):
     refresh_token: NotRequired[str]
     scope: NotRequired[str]
 
+# Standard to URL-safe base64 alphabet (RFC 4648 section 5).
+_URLSAFE_B64_TABLE = bytes.maketrans(b"+/", b"-_")
+
 def create_pkce_pair() -> tuple[str, str]:
     """Create (code_verifier, code_challenge) for PKCE (S256)."""
     code_verifier = secrets.token_urlsafe(64)
     verifier_bytes = code_verifier.encode("ascii")
     challenge_bytes = hashlib.sha256(verifier_bytes).digest()
-    code_challenge = base64.urlsafe_b64encode(challenge_bytes).rstrip(b"=").decode("ascii")
+    code_challenge = (
+        binascii.b2a_base64(challenge_bytes, newline=False)
+        .translate(_URLSAFE_B64_TABLE)
+        .rstrip(b"=")
+        .decode("ascii")
+    )
     return code_verifier, code_challenge
 
 def build_authorize_url(
@@ -98,6 +129,13 @@ def build_authorize_url(
     )
     return f"{OAUTH2_AUTHORIZE_URL}?{query}"
 
+@lru_cache(maxsize=8)
+def _basic_auth_header(client_id: str, client_secret: str) -> str:
+    # Client credentials rarely change within a process, so token exchanges
+    # and refreshes reuse the encoded header.
+    basic = base64.b64encode(f"{client_id}:{client_secret}".encode("ascii")).decode("ascii")
+    return f"Basic {basic}"
+
 def exchange_code_for_token(
     code: str,
     code_verifier: str,
@@ -116,10 +154,9 @@ def exchange_code_for_token(
     }
 
     if client_secret:
-        basic = base64.b64encode(f"{client_id}:{client_secret}".encode("ascii")).decode("ascii")
-        headers["Authorization"] = f"Basic {basic}"
+        headers["Authorization"] = _basic_auth_header(client_id, client_secret)
 
-    response = requests.post(OAUTH2_TOKEN_URL, headers=headers, data=data, timeout=30)
+    response = get_session().post(OAUTH2_TOKEN_URL, headers=headers, data=data, timeout=30)
     if not response.ok:
         message = f"OAuth2 token exchange failed: {response.status_code} {response.text}"
         if response.status_code == 401 and "Missing valid authorization header" in response.text:
@@ -149,10 +186,9 @@ def refresh_access_token(
     }
 
     if client_secret:
-        basic = base64.b64encode(f"{client_id}:{client_secret}".encode("ascii")).decode("ascii")
-        headers["Authorization"] = f"Basic {basic}"
+        headers["Authorization"] = _basic_auth_header(client_id, client_secret)
 
-    response = requests.post(OAUTH2_TOKEN_URL, headers=headers, data=data, timeout=30)
+    response = get_session().post(OAUTH2_TOKEN_URL, headers=headers, data=data, timeout=30)
     if not response.ok:
         raise RuntimeError(f"OAuth2 refresh failed: {response.status_code} {response.text}")
 
@@ -163,7 +199,7 @@ def refresh_access_token(
 
 def get_user_me(access_token: str) -> dict[str, Any]:
     """Fetch the authenticated user's profile via /2/users/me."""
-    response = requests.get(
+    response = get_session().get(
         OAUTH2_ME_URL,
         headers={"Authorization": f"Bearer {access_token}"},
         timeout=30,
@@ -194,10 +230,8 @@ def write_oauth2_fixtures(
     os.makedirs(fixtures_dir, exist_ok=True)
     token_path = os.path.join(fixtures_dir, "oauth2_token.json")
     user_path = os.path.join(fixtures_dir, "oauth2_user.json")
-    with open(token_path, "w") as f:
-        json.dump(redact_token_for_fixture(token), f, indent=2)
-    with open(user_path, "w") as f:
-        json.dump(user_payload, f, indent=2)
+    json_compat.write_file(token_path, redact_token_for_fixture(token), indent=True)
+    json_compat.write_file(user_path, user_payload, indent=True)
 
 def oauth2_login_flow(record_fixtures: bool = False, profile: str | None = None) -> dict[str, Any]:
     """Run the OAuth2 login flow and return the /2/users/me payload."""
@@ -227,8 +261,8 @@ def oauth2_login_flow(record_fixtures: bool = False, profile: str | None = None)
     print(f"\nWaiting for callback on {redirect_uri} ...")
 
     params = wait_for_oauth_callback(redirect_uri=redirect_uri, timeout_seconds=180)
-    returned_state = params.get("state", [None])[0]
-    code = params.get("code", [None])[0]
+    returned_state = params.get("state")
+    code = params.get("code")
 
     if not code or returned_state != state:
         raise RuntimeError("Invalid OAuth2 callback (missing code or state mismatch)")
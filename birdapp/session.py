@@ -1,14 +1,24 @@
 import json
 import os
 import shutil
+import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Dict, Generator, Mapping, Optional
+
+if sys.platform == "win32":  # pragma: no cover - Windows
+    import msvcrt
+else:
+    import fcntl
 
 import platformdirs
-from requests_oauthlib import OAuth2Session
-from .auth import create_oauth2_session
+from . import json_compat
 from .config import get_active_profile
 
+if TYPE_CHECKING:
+    from requests_oauthlib import OAuth2Session
+
 def get_sessions_dir() -> str:
     """Get or create the sessions directory."""
     override = os.getenv("BIRDAPP_SESSIONS_DIR")
@@ -27,6 +37,54 @@ def get_sessions_dir() -> str:
     return sessions_dir
 
 
+def get_tokens_path() -> str:
+    """Path of the tokens file inside the sessions directory."""
+    return os.path.join(get_sessions_dir(), "tokens.json")
+
+
+def _try_lock(handle: Any) -> bool:
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(handle: Any) -> None:
+    if sys.platform == "win32":
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def token_refresh_lock(profile: str, timeout: float = 30.0) -> Generator[None, None, None]:
+    """
+    Hold an inter-process lock while `profile`'s OAuth2 token is refreshed.
+
+    X invalidates a refresh token once it is used, so two processes refreshing
+    the same profile at once would leave one of them with a dead token. After
+    acquiring the lock, callers should re-load the stored token: if it changed,
+    another process already refreshed it.
+    """
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in profile)
+    lock_path = os.path.join(get_sessions_dir(), f"{safe_name}.refresh.lock")
+    deadline = time.monotonic() + timeout
+    with open(lock_path, "a+") as handle:
+        while not _try_lock(handle):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for the token refresh lock for {profile!r}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(handle)
+
+
 def _migrate_legacy_tokens(sessions_dir: str) -> None:
     """
     Migrate tokens from older locations into the current sessions directory.
@@ -73,8 +131,7 @@ def _load_tokens(tokens_path: str) -> Dict[str, Any]:
 
 def save_token(user_id: str, token: Mapping[str, Any], profile: str | None = None) -> None:
     """Save a user's token to the tokens file."""
-    sessions_dir = get_sessions_dir()
-    tokens_path = os.path.join(sessions_dir, "tokens.json")
+    tokens_path = get_tokens_path()
     
     tokens = _load_tokens(tokens_path)
     profile_name = _resolve_profile(profile, tokens)
@@ -91,9 +148,9 @@ def save_token(user_id: str, token: Mapping[str, Any], profile: str | None = Non
     else:
         tokens[user_id] = dict(token)
     
-    # Save updated tokens
-    with open(tokens_path, "w") as f:
-        json.dump(tokens, f)
+    # Save updated tokens. The temporary file is created 0600, so tokens are
+    # never briefly world-readable; the chmod covers pre-existing files.
+    json_compat.write_file(tokens_path, tokens)
     try:
         os.chmod(tokens_path, 0o600)
     except OSError:
@@ -101,8 +158,7 @@ def save_token(user_id: str, token: Mapping[str, Any], profile: str | None = Non
 
 def load_token(user_id: str, profile: str | None = None) -> Optional[Dict[str, Any]]:
     """Load a user's token from the tokens file."""
-    sessions_dir = get_sessions_dir()
-    tokens_path = os.path.join(sessions_dir, "tokens.json")
+    tokens_path = get_tokens_path()
     
     tokens = _load_tokens(tokens_path)
     profiles = tokens.get("profiles")
@@ -116,11 +172,14 @@ def load_token(user_id: str, profile: str | None = None) -> Optional[Dict[str, A
         return None
     return tokens.get(user_id)
 
-def create_session_from_token(token: Dict[str, Any]) -> OAuth2Session:
+def create_session_from_token(token: Dict[str, Any]) -> "OAuth2Session":
     """Create a new OAuth2Session from a token."""
+    # Deferred so CLI startup does not import requests_oauthlib.
+    from .auth import create_oauth2_session
+
     return create_oauth2_session(token)
 
-def get_user_session(user_id: str, profile: str | None = None) -> tuple[Optional[OAuth2Session], Optional[Dict[str, Any]]]:
+def get_user_session(user_id: str, profile: str | None = None) -> tuple[Optional["OAuth2Session"], Optional[Dict[str, Any]]]:
     """Get a user's session and token."""
     token = load_token(user_id, profile=profile)
     if token:
@@ -136,8 +195,7 @@ def has_oauth2_token(profile: str | None = None) -> bool:
     Return True if any OAuth2 token (with an access_token) exists for the given
     profile (or the active profile when omitted).
     """
-    sessions_dir = get_sessions_dir()
-    tokens_path = os.path.join(sessions_dir, "tokens.json")
+    tokens_path = get_tokens_path()
     tokens = _load_tokens(tokens_path)
     profiles = tokens.get("profiles")
     if not isinstance(profiles, dict):
@@ -171,8 +229,7 @@ def load_any_oauth2_token(profile: str) -> tuple[str, Dict[str, Any]] | None:
 
     Returns (user_id, token) when present, otherwise None.
     """
-    sessions_dir = get_sessions_dir()
-    tokens_path = os.path.join(sessions_dir, "tokens.json")
+    tokens_path = get_tokens_path()
     tokens = _load_tokens(tokens_path)
     profiles = tokens.get("profiles")
     if not isinstance(profiles, dict):
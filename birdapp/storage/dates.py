@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Optional
 
 
+@lru_cache(maxsize=65536)
+def _parse_iso_datetime(candidate: str) -> Optional[datetime]:
+    # Result rows often repeat timestamps; datetimes are immutable, so parsed
+    # values are safe to share.
+    try:
+        parsed = datetime.fromisoformat(candidate)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
 def coerce_datetime(value: Any) -> Optional[datetime]:
     if value is None:
         return None
@@ -16,13 +30,7 @@ def coerce_datetime(value: Any) -> Optional[datetime]:
         if not candidate:
             return None
         # SQLite drivers often return naive datetime strings from raw SQL.
-        try:
-            parsed = datetime.fromisoformat(candidate)
-        except ValueError:
-            return None
-        if parsed.tzinfo is None:
-            return parsed.replace(tzinfo=timezone.utc)
-        return parsed.astimezone(timezone.utc)
+        return _parse_iso_datetime(candidate)
     return None
 
 
@@ -1,9 +1,31 @@
+import logging
 from pathlib import Path
+from typing import Any
 
 from platformdirs import user_data_dir
+from sqlalchemy import UniqueConstraint, event, inspect, text
 from sqlalchemy.engine import Engine
 from sqlmodel import SQLModel, Session, create_engine
 
+from .. import json_compat
+
+logger = logging.getLogger(__name__)
+
+# Connection settings for large archive imports: WAL with synchronous=NORMAL
+# drops the fsync on every commit, and the bigger page cache and mmap window
+# keep index pages in memory while rows stream in.
+_BULK_LOAD_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-262144",
+    "mmap_size=268435456",
+)
+
+# SQLite user_version from which the entity tables carry their natural-key
+# UNIQUE constraints.
+_NATURAL_KEY_SCHEMA_VERSION = 1
+
 
 def get_default_db_url() -> str:
     data_dir = Path(user_data_dir("birdapp"))
@@ -12,11 +34,97 @@ def get_default_db_url() -> str:
 
 
 def get_engine(db_url: str, *, echo: bool = False) -> Engine:
-    return create_engine(db_url, echo=echo)
+    # JSON columns (tweet edit_info, media sizes, note payloads, ...) are
+    # encoded and decoded through orjson when the speedups extra is installed.
+    return create_engine(
+        db_url,
+        echo=echo,
+        json_serializer=json_compat.dumps,
+        json_deserializer=json_compat.loads,
+    )
+
+
+def enable_bulk_load_pragmas(engine: Engine) -> None:
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_bulk_load_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in _BULK_LOAD_PRAGMAS:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
 
 
 def init_db(engine: Engine) -> None:
     SQLModel.metadata.create_all(engine)
+    _ensure_indexes(engine)
+    _ensure_unique_constraints(engine)
+
+
+def _ensure_indexes(engine: Engine) -> None:
+    # create_all skips the indexes of tables that already exist, so secondary
+    # indexes dropped for a fresh bulk import are rebuilt here if the import
+    # died before it could recreate them.
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+def _ensure_unique_constraints(engine: Engine) -> None:
+    # create_all never alters existing tables, so databases created before the
+    # entity tables gained natural-key UNIQUE constraints have none, and the
+    # importer's ON CONFLICT clauses would have nothing to conflict on. Add
+    # each missing constraint as a unique index, dropping legacy duplicates
+    # (keeping the newest row) so the index can be built. Runs once per
+    # database; SQLite's user_version records that it has.
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as connection:
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar_one()
+        if version >= _NATURAL_KEY_SCHEMA_VERSION:
+            return
+        inspector = inspect(connection)
+        for table in SQLModel.metadata.sorted_tables:
+            existing: set[tuple[str | None, ...]] = {
+                tuple(constraint["column_names"])
+                for constraint in inspector.get_unique_constraints(table.name)
+            }
+            existing.update(
+                tuple(index["column_names"])
+                for index in inspector.get_indexes(table.name)
+                if index["unique"]
+            )
+            for constraint in table.constraints:
+                if not isinstance(constraint, UniqueConstraint):
+                    continue
+                columns = tuple(column.name for column in constraint.columns)
+                if columns in existing:
+                    continue
+                column_list = ", ".join(f'"{name}"' for name in columns)
+                deleted = connection.execute(
+                    text(
+                        f'DELETE FROM "{table.name}" WHERE rowid NOT IN '
+                        f'(SELECT MAX(rowid) FROM "{table.name}" GROUP BY {column_list})'
+                    )
+                ).rowcount
+                if deleted:
+                    logger.warning(
+                        "Removed %d duplicate %s rows before adding %s",
+                        deleted,
+                        table.name,
+                        constraint.name,
+                    )
+                connection.execute(
+                    text(
+                        f'CREATE UNIQUE INDEX IF NOT EXISTS "{constraint.name}" '
+                        f'ON "{table.name}" ({column_list})'
+                    )
+                )
+        connection.exec_driver_sql(f"PRAGMA user_version = {_NATURAL_KEY_SCHEMA_VERSION}")
 
 
 def get_session(engine: Engine) -> Session:
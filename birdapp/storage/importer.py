@@ -1,15 +1,36 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime, timezone
+import shutil
+import sys
+import tempfile
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, closing
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Iterable, Optional, Sequence, TypeVar
+from typing import Any, Iterable, Iterator, Mapping, Optional
 
 import requests
 import zipfile
-from sqlmodel import Session, select
 
-from .db import get_default_db_url, get_engine, get_session, init_db
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional "speedups" extra
+    ijson = None
+from sqlalchemy import Index, Insert, bindparam, insert, or_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import Select
+from sqlmodel import Session, SQLModel, col, select
+
+from .. import json_compat
+from .db import (
+    enable_bulk_load_pragmas,
+    get_default_db_url,
+    get_engine,
+    get_session,
+    init_db,
+)
 from .models import (
     Account,
     Follower,
@@ -25,9 +46,7 @@ from .models import (
     TweetUserMention,
     UploadOptions,
 )
-from .search import ensure_tweet_fts, sync_tweet_fts
-
-ModelType = TypeVar("ModelType")
+from .search import ensure_tweet_fts, migrate_tweet_fts_rowids, sync_tweet_fts_from_tweets
 
 ARCHIVE_URL_TEMPLATE = (
     "https://fabxmporizzqflnftavs.supabase.co/storage/v1/object/public/"
@@ -36,6 +55,200 @@ ARCHIVE_URL_TEMPLATE = (
 
 _TWITTER_ZIP_MANIFEST_PATH = "data/manifest.js"
 
+# Shared string constants for the import hot loops.
+_EMPTY = ""
+_KIND_TWEET = sys.intern("tweet")
+_KIND_COMMUNITY = sys.intern("community")
+_ENT_ENTITIES = sys.intern("entities")
+_ENT_EXTENDED = sys.intern("extended")
+
+# Natural keys used to deduplicate child entity rows. Nullable columns are part
+# of the key, so comparisons happen on Python tuples where None == None.
+_CHILD_KEY_COLUMNS: dict[type[SQLModel], tuple[str, ...]] = {
+    TweetHashtag: ("tweet_id", "text", "start_index", "end_index"),
+    TweetSymbol: ("tweet_id", "text", "start_index", "end_index"),
+    TweetUserMention: (
+        "tweet_id",
+        "user_id",
+        "user_id_str",
+        "name",
+        "screen_name",
+        "start_index",
+        "end_index",
+    ),
+    TweetUrl: (
+        "tweet_id",
+        "url",
+        "expanded_url",
+        "display_url",
+        "start_index",
+        "end_index",
+    ),
+    TweetMedia: ("tweet_id", "entity_type", "media_id", "media_id_str", "url", "media_url"),
+}
+_CHILD_COUNT_KEYS: dict[type[SQLModel], str] = {
+    TweetHashtag: "tweet_hashtag",
+    TweetSymbol: "tweet_symbol",
+    TweetUserMention: "tweet_user_mention",
+    TweetUrl: "tweet_url",
+    TweetMedia: "tweet_media",
+}
+
+# Bulk INSERTs per staged table. Entity tables carry UNIQUE constraints on
+# their natural keys (`init_db` adds them to older databases), so a row that
+# slipped past the prefetched key sets is dropped by SQLite instead of
+# duplicated. Tweets use the per-kind upserts in `_TWEET_UPSERT_STATEMENTS`
+# instead.
+_BULK_INSERT_STATEMENTS: dict[type[SQLModel], Insert] = {
+    model: sqlite_insert(model).on_conflict_do_nothing()
+    for model in _CHILD_KEY_COLUMNS
+}
+
+
+# Notes, likes and follow edges upsert on their primary key or existing
+# (account_id, key) UNIQUE constraints instead of a SELECT per row.
+_UPSERT_KEY_COLUMNS: dict[type[SQLModel], str] = {
+    NoteTweet: "note_tweet_id",
+    Like: "tweet_id",
+    Follower: "follower_account_id",
+    Following: "followed_account_id",
+}
+_UPSERT_COUNT_KEYS: dict[type[SQLModel], str] = {
+    NoteTweet: "note_tweet",
+    Like: "like",
+    Follower: "follower",
+    Following: "following",
+}
+
+
+def _upsert_statement(
+    model: type[SQLModel],
+    index_elements: tuple[str, ...],
+    update_columns: tuple[str, ...],
+) -> Insert:
+    statement = sqlite_insert(model)
+    excluded = statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={name: excluded[name] for name in update_columns},
+        # Leave unchanged rows alone so a reimport does not rewrite them (or
+        # re-encode their JSON) for nothing.
+        where=or_(
+            *(
+                getattr(model, name).is_distinct_from(excluded[name])
+                for name in update_columns
+            )
+        ),
+    )
+
+
+_UPSERT_STATEMENTS: dict[type[SQLModel], Insert] = {
+    NoteTweet: _upsert_statement(
+        NoteTweet,
+        ("note_tweet_id",),
+        ("account_id", "created_at", "updated_at", "lifecycle", "core"),
+    ),
+    Like: _upsert_statement(
+        Like, ("account_id", "tweet_id"), ("full_text", "expanded_url")
+    ),
+    Follower: _upsert_statement(
+        Follower, ("account_id", "follower_account_id"), ("user_link",)
+    ),
+    Following: _upsert_statement(
+        Following, ("account_id", "followed_account_id"), ("user_link",)
+    ),
+}
+
+# Every column `_build_tweet_row` fills in, in row order.
+_TWEET_ROW_COLUMNS = (
+    "tweet_id",
+    "account_id",
+    "tweet_id_str",
+    "tweet_kind",
+    "created_at",
+    "full_text",
+    "lang",
+    "source",
+    "retweeted",
+    "favorited",
+    "truncated",
+    "favorite_count",
+    "retweet_count",
+    "display_text_range",
+    "in_reply_to_status_id",
+    "in_reply_to_status_id_str",
+    "in_reply_to_user_id",
+    "in_reply_to_user_id_str",
+    "in_reply_to_screen_name",
+    "possibly_sensitive",
+    "edit_info",
+    "community_id",
+    "community_id_str",
+    "scopes",
+)
+_COMMUNITY_TWEET_COLUMNS = ("community_id", "community_id_str", "scopes")
+
+# Tweets upsert on their primary key, so a reimported or repeated tweet is
+# rewritten in the same executemany as the new ones. Plain tweets carry no
+# community metadata, so their upsert leaves those columns as stored.
+_TWEET_UPSERT_STATEMENTS: dict[str, Insert] = {
+    _KIND_TWEET: _upsert_statement(
+        Tweet,
+        ("tweet_id",),
+        tuple(
+            name for name in _TWEET_ROW_COLUMNS[1:] if name not in _COMMUNITY_TWEET_COLUMNS
+        ),
+    ),
+    _KIND_COMMUNITY: _upsert_statement(Tweet, ("tweet_id",), _TWEET_ROW_COLUMNS[1:]),
+}
+
+# Keep IN lists under SQLite's default 999 host-parameter limit.
+_IN_CLAUSE_CHUNK_SIZE = 900
+
+# Owners of already-stored tweets, fetched per batch to reject id collisions
+# across owners and to tell new tweets from reimported ones.
+_TWEET_OWNERS_STATEMENT = select(Tweet.tweet_id, Tweet.account_id).where(
+    col(Tweet.tweet_id).in_(bindparam("tweet_ids", expanding=True))
+)
+
+# Key prefetch queries are built once with an expanding IN parameter, so each
+# batch only binds new values instead of constructing and compiling a SELECT.
+_CHILD_KEY_STATEMENTS: dict[type[SQLModel], Select[Any]] = {
+    model: select(*(getattr(model, name) for name in key_names)).where(
+        getattr(model, "tweet_id").in_(bindparam("tweet_ids", expanding=True))
+    )
+    for model, key_names in _CHILD_KEY_COLUMNS.items()
+}
+# Note ids are unique across all owners, so their existing keys are looked up
+# by id; likes and follow edges are keyed per owner and loaded per owner.
+_GLOBAL_KEY_STATEMENTS: dict[type[SQLModel], Select[Any]] = {
+    NoteTweet: select(NoteTweet.note_tweet_id).where(
+        col(NoteTweet.note_tweet_id).in_(bindparam("keys", expanding=True))
+    ),
+}
+_OWNER_KEY_STATEMENTS: dict[type[SQLModel], Select[Any]] = {
+    model: select(getattr(model, key_name)).where(
+        getattr(model, "account_id") == bindparam("account_id")
+    )
+    for model, key_name in _UPSERT_KEY_COLUMNS.items()
+    if model not in _GLOBAL_KEY_STATEMENTS
+}
+
+# Tables whose non-unique indexes are rebuilt in one pass after a fresh import
+# rather than maintained row by row. UNIQUE indexes stay: upserts need them.
+_BULK_LOAD_TABLES = (
+    "tweet",
+    "tweet_hashtag",
+    "tweet_symbol",
+    "tweet_user_mention",
+    "tweet_url",
+    "tweet_media",
+    "note_tweet",
+    "like",
+    "follower",
+    "following",
+)
+
 
 def build_archive_url(username: str) -> str:
     return ARCHIVE_URL_TEMPLATE.format(username=username)
@@ -44,27 +257,114 @@ def build_archive_url(username: str) -> str:
 def download_archive(url: str) -> dict[str, Any]:
     response = requests.get(url, timeout=60)
     response.raise_for_status()
-    return response.json()
+    return json_compat.loads(response.content)
+
+
+def _download_archive_file(url: str, destination: Path) -> Path:
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        with destination.open("wb") as handle:
+            shutil.copyfileobj(response.raw, handle)
+    return destination
 
 
 def load_archive(path: str | Path) -> dict[str, Any]:
-    path = Path(path)
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    # Decoded from raw bytes so orjson (when installed) skips the str copy.
+    return json_compat.loads(Path(path).read_bytes())
+
+
+# Archives at least this large are imported section by section straight from
+# disk. Each section costs a full tokenizing pass over the file, so smaller
+# archives are cheaper to load whole.
+_STREAM_ARCHIVE_MIN_BYTES = 256 * 1024 * 1024
+
+_ARCHIVE_SECTIONS = (
+    "upload-options",
+    "account",
+    "profile",
+    "tweets",
+    "community-tweet",
+    "note-tweet",
+    "like",
+    "follower",
+    "following",
+)
+# Top-level archive keys holding a single object rather than an array.
+_OBJECT_SECTIONS = frozenset({"upload-options"})
+
+
+class _ArchiveSection:
+    """A top-level archive array that is parsed from disk on each iteration."""
+
+    __slots__ = ("_path", "_prefix")
 
+    def __init__(self, path: Path, key: str) -> None:
+        self._path = path
+        self._prefix = f"{key}.item"
 
-def _parse_js_assigned_json_payload(contents: str) -> Any:
+    def __iter__(self) -> Iterator[Any]:
+        assert ijson is not None
+        with self._path.open("rb") as handle:
+            yield from ijson.items(handle, self._prefix, use_float=True)
+
+    def first(self) -> Any:
+        """Return the first item, or None, closing the parse and file at once."""
+        with closing(iter(self)) as items:
+            return next(items, None)
+
+
+class _StreamedArchive(Mapping[str, Any]):
+    """
+    Read-only view of an archive file that never holds more than one item of
+    an array section in memory.
+
+    Missing array sections iterate as empty, so every known key is reported
+    as present.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _OBJECT_SECTIONS:
+            return _ArchiveSection(self._path, key)
+        assert ijson is not None
+        with self._path.open("rb") as handle:
+            for value in ijson.items(handle, key, use_float=True):
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_ARCHIVE_SECTIONS)
+
+    def __len__(self) -> int:
+        return len(_ARCHIVE_SECTIONS)
+
+
+def _open_archive(path: Path) -> Mapping[str, Any]:
+    if zipfile.is_zipfile(path):
+        return load_twitter_zip(path)
+    if ijson is not None and path.stat().st_size >= _STREAM_ARCHIVE_MIN_BYTES:
+        return _StreamedArchive(path)
+    return load_archive(path)
+
+
+def _parse_js_assigned_json_payload(contents: bytes) -> Any:
     """
     Parse Twitter ZIP `.js` files that wrap a JSON payload in a JavaScript assignment, e.g.
     `window.YTD.tweets.part0 = [ ... ]`.
+
+    Works on the raw UTF-8 bytes: the JSON parser validates the encoding itself,
+    so the payload is never decoded to `str` first.
     """
-    idx = contents.find("=")
+    idx = contents.find(b"=")
     if idx < 0:
         raise ValueError("Expected a JavaScript assignment containing a JSON payload.")
-    payload = contents[idx + 1 :].strip()
-    if payload.endswith(";"):
-        payload = payload[:-1].strip()
-    return json.loads(payload)
+    payload = contents[idx + 1 :].rstrip()
+    if payload.endswith(b";"):
+        payload = payload[:-1]
+    return json_compat.loads(payload)
 
 
 def _load_twitter_zip_manifest(archive: zipfile.ZipFile) -> dict[str, Any] | None:
@@ -72,8 +372,7 @@ def _load_twitter_zip_manifest(archive: zipfile.ZipFile) -> dict[str, Any] | Non
         raw = archive.read(_TWITTER_ZIP_MANIFEST_PATH)
     except KeyError:
         return None
-    contents = raw.decode("utf-8")
-    parsed = _parse_js_assigned_json_payload(contents)
+    parsed = _parse_js_assigned_json_payload(raw)
     if not isinstance(parsed, dict):
         raise ValueError("Twitter archive manifest did not parse to an object.")
     return parsed
@@ -142,8 +441,7 @@ def load_twitter_zip(path: str | Path) -> dict[str, Any]:
                     raw = archive.read(file_name)
                 except KeyError:
                     continue
-                contents = raw.decode("utf-8")
-                parsed = _parse_js_assigned_json_payload(contents)
+                parsed = _parse_js_assigned_json_payload(raw)
                 if not isinstance(parsed, list):
                     raise ValueError(
                         f"Twitter archive file {file_name!r} did not parse to a list."
@@ -159,27 +457,101 @@ def load_twitter_zip(path: str | Path) -> dict[str, Any]:
 
 
 def _safe_int(value: Any) -> Optional[int]:
-    if value is None:
-        return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str) and value.strip():
+    # Archives store most numbers as strings, so that case is tried first;
+    # `int` already ignores surrounding whitespace and rejects blank strings.
+    if isinstance(value, str):
         try:
             return int(value)
         except ValueError:
             return None
+    if isinstance(value, int):
+        return value
     return None
 
 
 def _indices_to_bounds(indices: Iterable[Any]) -> tuple[Optional[int], Optional[int]]:
-    items = list(indices)
-    if len(items) != 2:
+    if not isinstance(indices, (list, tuple)):
+        indices = tuple(indices)
+    if len(indices) != 2:
         return None, None
-    return _safe_int(items[0]), _safe_int(items[1])
+    start, end = indices
+    return _safe_int(start), _safe_int(end)
+
+
+def _fetch_child_keys(
+    session: Session, model: type[SQLModel], tweet_ids: list[str]
+) -> set[tuple[Any, ...]]:
+    statement = _CHILD_KEY_STATEMENTS[model]
+    connection = session.connection()
+    keys: set[tuple[Any, ...]] = set()
+    for start in range(0, len(tweet_ids), _IN_CLAUSE_CHUNK_SIZE):
+        chunk = tweet_ids[start : start + _IN_CLAUSE_CHUNK_SIZE]
+        keys.update(
+            tuple(found) for found in connection.execute(statement, {"tweet_ids": chunk})
+        )
+    return keys
+
+
+def _fetch_global_keys(
+    session: Session, model: type[SQLModel], keys: list[str]
+) -> set[str]:
+    statement = _GLOBAL_KEY_STATEMENTS[model]
+    connection = session.connection()
+    found: set[str] = set()
+    for start in range(0, len(keys), _IN_CLAUSE_CHUNK_SIZE):
+        chunk = keys[start : start + _IN_CLAUSE_CHUNK_SIZE]
+        found.update(connection.execute(statement, {"keys": chunk}).scalars())
+    return found
+
+
+def _fetch_owner_keys(
+    session: Session, model: type[SQLModel], owner_account_id: Optional[str]
+) -> set[str]:
+    statement = _OWNER_KEY_STATEMENTS[model]
+    connection = session.connection()
+    return set(connection.execute(statement, {"account_id": owner_account_id}).scalars())
+
+
+# Twitter's legacy timestamp format, e.g. "Wed Oct 10 20:19:24 +0000 2018",
+# used for every tweet in a downloaded account archive.
+_LEGACY_DATETIME_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        start=1,
+    )
+}
+
+
+def _parse_legacy_datetime(value: str) -> Optional[datetime]:
+    """
+    Parse `_LEGACY_DATETIME_FORMAT` by slicing its fixed-width fields.
 
-def _exists(session: Session, model: type[ModelType], filters: Sequence[Any]) -> bool:
-    statement = select(model).where(*filters).limit(1)
-    return session.exec(statement).first() is not None
+    strptime spends most of its time on locale-aware regex matching; this
+    handles the archive's own layout and returns None for anything else so the
+    caller can fall back to strptime.
+    """
+    parts = value.split(" ")
+    if len(parts) != 6:
+        return None
+    _, month_name, day, clock, offset, year = parts
+    month = _MONTHS.get(month_name)
+    if month is None or len(clock) != 8 or len(offset) != 5 or offset[0] not in "+-":
+        return None
+    try:
+        if offset == "+0000":
+            tzinfo = timezone.utc
+        else:
+            minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+            tzinfo = timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+        return datetime(
+            int(year), month, int(day),
+            int(clock[0:2]), int(clock[3:5]), int(clock[6:8]),
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
 
 
 def _parse_archive_datetime(value: Any) -> Optional[datetime]:
@@ -193,31 +565,291 @@ def _parse_archive_datetime(value: Any) -> Optional[datetime]:
         candidate = value.strip()
         if not candidate:
             return None
+        if candidate[0].isalpha():
+            # Legacy archive format; ISO strings always start with a digit.
+            parsed = _parse_legacy_datetime(candidate)
+            if parsed is None:
+                try:
+                    parsed = datetime.strptime(candidate, _LEGACY_DATETIME_FORMAT)
+                except ValueError:
+                    return None
+            return parsed.astimezone(timezone.utc)
         if candidate.endswith("Z"):
             candidate = candidate[:-1] + "+00:00"
         try:
             parsed = datetime.fromisoformat(candidate)
         except ValueError:
-            try:
-                parsed = datetime.strptime(candidate, "%a %b %d %H:%M:%S %z %Y")
-            except ValueError:
-                return None
+            return None
         if parsed.tzinfo is None:
             return parsed.replace(tzinfo=timezone.utc)
         return parsed.astimezone(timezone.utc)
     return None
 
 
-def _get_owner_account_id(data: dict[str, Any]) -> Optional[str]:
-    account_list = data.get("account") or []
-    if not account_list:
+def _optional_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _build_tweet_row(
+    tweet: dict[str, Any], tweet_id: str, owner_account_id: str, kind: str
+) -> dict[str, Any]:
+    """
+    Marshal one archive tweet into `tweet` table column values.
+
+    This is the per-row hot path of an import, so each source field is read
+    exactly once through a bound `get`.
+    """
+    get = tweet.get
+    display_text_range = get("display_text_range")
+    possibly_sensitive = get("possibly_sensitive")
+    row: dict[str, Any] = {
+        "tweet_id": tweet_id,
+        "account_id": owner_account_id,
+        "tweet_id_str": str(get("id_str", _EMPTY)) or None,
+        "tweet_kind": kind,
+        "created_at": _parse_archive_datetime(get("created_at")),
+        "full_text": str(get("full_text", _EMPTY)),
+        # Low-cardinality fields are interned: rows then share one string
+        # object per value, and worker results pickle each value once.
+        "lang": sys.intern(str(get("lang", _EMPTY))),
+        "source": sys.intern(str(get("source", _EMPTY))),
+        "retweeted": bool(get("retweeted")),
+        "favorited": bool(get("favorited")),
+        "truncated": bool(get("truncated")),
+        "favorite_count": _safe_int(get("favorite_count")),
+        "retweet_count": _safe_int(get("retweet_count")),
+        "display_text_range": (
+            [v for v in map(_safe_int, display_text_range) if v is not None]
+            if display_text_range is not None
+            else None
+        ),
+        "in_reply_to_status_id": _optional_str(get("in_reply_to_status_id")),
+        "in_reply_to_status_id_str": _optional_str(get("in_reply_to_status_id_str")),
+        "in_reply_to_user_id": _optional_str(get("in_reply_to_user_id")),
+        "in_reply_to_user_id_str": _optional_str(get("in_reply_to_user_id_str")),
+        "in_reply_to_screen_name": _optional_str(get("in_reply_to_screen_name")),
+        "possibly_sensitive": (
+            bool(possibly_sensitive) if possibly_sensitive is not None else None
+        ),
+        "edit_info": get("edit_info"),
+    }
+    # Every row carries the same columns so one executemany covers a batch.
+    if kind == _KIND_COMMUNITY:
+        row["community_id"] = str(get("community_id", _EMPTY)) or None
+        row["community_id_str"] = str(get("community_id_str", _EMPTY)) or None
+        row["scopes"] = get("scopes")
+    else:
+        row["community_id"] = row["community_id_str"] = row["scopes"] = None
+    return row
+
+
+_EntityRow = tuple[type[SQLModel], tuple[Any, ...], dict[str, Any]]
+
+
+def _media_entry(media: dict[str, Any], tweet_id: str, entity_type: str) -> _EntityRow:
+    get = media.get
+    media_id = str(get("id", _EMPTY)) or None
+    media_id_str = str(get("id_str", _EMPTY)) or None
+    url = str(get("url", _EMPTY))
+    media_url = str(get("media_url", _EMPTY))
+    extended = entity_type == _ENT_EXTENDED
+    return TweetMedia, (tweet_id, entity_type, media_id, media_id_str, url, media_url), {
+        "tweet_id": tweet_id,
+        "entity_type": entity_type,
+        "media_id": media_id,
+        "media_id_str": media_id_str,
+        "media_type": sys.intern(str(get("type", _EMPTY))),
+        "url": url,
+        "expanded_url": str(get("expanded_url", _EMPTY)),
+        "display_url": str(get("display_url", _EMPTY)),
+        "media_url": media_url,
+        "media_url_https": str(get("media_url_https", _EMPTY)),
+        "sizes": get("sizes"),
+        # Only extended_entities media carries these; plain entities store NULL.
+        "video_info": get("video_info") if extended else None,
+        "additional_media_info": get("additional_media_info") if extended else None,
+        "source_status_id": _optional_str(get("source_status_id")),
+        "source_status_id_str": _optional_str(get("source_status_id_str")),
+        "source_user_id": _optional_str(get("source_user_id")),
+        "source_user_id_str": _optional_str(get("source_user_id_str")),
+    }
+
+
+def _iter_entity_rows(
+    tweet: dict[str, Any], tweet_id: str, *, include_media: bool
+) -> Iterator[_EntityRow]:
+    """
+    Yield `(model, natural_key, row)` for each entity of `tweet`.
+
+    Every field is converted once and shared between the dedup key (ordered as
+    in `_CHILD_KEY_COLUMNS`) and the insert row.
+    """
+    entities = tweet.get("entities") or {}
+    for hashtag in entities.get("hashtags") or []:
+        text = str(hashtag.get("text", _EMPTY))
+        start_index, end_index = _indices_to_bounds(hashtag.get("indices") or [])
+        yield TweetHashtag, (tweet_id, text, start_index, end_index), {
+            "tweet_id": tweet_id,
+            "text": text,
+            "start_index": start_index,
+            "end_index": end_index,
+        }
+    for symbol in entities.get("symbols") or []:
+        text = str(symbol.get("text", _EMPTY))
+        start_index, end_index = _indices_to_bounds(symbol.get("indices") or [])
+        yield TweetSymbol, (tweet_id, text, start_index, end_index), {
+            "tweet_id": tweet_id,
+            "text": text,
+            "start_index": start_index,
+            "end_index": end_index,
+        }
+    for mention in entities.get("user_mentions") or []:
+        get = mention.get
+        user_id = str(get("id", _EMPTY)) or None
+        user_id_str = str(get("id_str", _EMPTY)) or None
+        name = str(get("name", _EMPTY))
+        screen_name = str(get("screen_name", _EMPTY))
+        start_index, end_index = _indices_to_bounds(get("indices") or [])
+        key = (tweet_id, user_id, user_id_str, name, screen_name, start_index, end_index)
+        yield TweetUserMention, key, {
+            "tweet_id": tweet_id,
+            "user_id": user_id,
+            "user_id_str": user_id_str,
+            "name": name,
+            "screen_name": screen_name,
+            "start_index": start_index,
+            "end_index": end_index,
+        }
+    for url in entities.get("urls") or []:
+        get = url.get
+        short_url = str(get("url", _EMPTY))
+        expanded_url = str(get("expanded_url", _EMPTY))
+        display_url = str(get("display_url", _EMPTY))
+        start_index, end_index = _indices_to_bounds(get("indices") or [])
+        key = (tweet_id, short_url, expanded_url, display_url, start_index, end_index)
+        yield TweetUrl, key, {
+            "tweet_id": tweet_id,
+            "url": short_url,
+            "expanded_url": expanded_url,
+            "display_url": display_url,
+            "start_index": start_index,
+            "end_index": end_index,
+        }
+    if not include_media:
+        return
+    for media in entities.get("media") or []:
+        yield _media_entry(media, tweet_id, _ENT_ENTITIES)
+    extended = tweet.get("extended_entities") or {}
+    for media in extended.get("media") or []:
+        yield _media_entry(media, tweet_id, _ENT_EXTENDED)
+
+
+# Entity rows are a lazy iterator on the serial path and a list when they
+# come back from a worker process; callers consume them exactly once.
+_NormalizedTweet = tuple[str, dict[str, Any], Iterable[_EntityRow]]
+
+# Tweets per task handed to a normalization worker; large enough that pickling
+# overhead is amortized, small enough that workers stay evenly loaded.
+_NORMALIZE_CHUNK_SIZE = 2000
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _iter_tweet_rows(
+    items: Iterable[dict[str, Any]], owner_account_id: str, kind: str, include_media: bool
+) -> Iterator[_NormalizedTweet]:
+    """
+    Yield the tweet row and a lazy iterator of entity rows for each archive item.
+
+    Nothing is accumulated here: the caller stages each tweet's entities
+    straight into its current batch.
+    """
+    for item in items:
+        tweet = item.get("tweet") or {}
+        tweet_id = str(tweet.get("id", _EMPTY))
+        if not tweet_id:
+            continue
+        yield (
+            tweet_id,
+            _build_tweet_row(tweet, tweet_id, owner_account_id, kind),
+            _iter_entity_rows(tweet, tweet_id, include_media=include_media),
+        )
+
+
+def _normalize_tweets(
+    items: list[dict[str, Any]], owner_account_id: str, kind: str, include_media: bool
+) -> list[_NormalizedTweet]:
+    """
+    Build the tweet row and entity rows for each archive item in `items`.
+
+    This is pure data conversion with no session access, so it can run in a
+    worker process; entity rows are materialized so the result can be pickled.
+    """
+    return [
+        (tweet_id, row, list(entity_rows))
+        for tweet_id, row, entity_rows in _iter_tweet_rows(
+            items, owner_account_id, kind, include_media
+        )
+    ]
+
+
+def _iter_normalized_tweets(
+    items: Iterable[dict[str, Any]],
+    owner_account_id: str,
+    kind: str,
+    *,
+    include_media: bool,
+    workers: int,
+) -> Iterator[_NormalizedTweet]:
+    """
+    Yield normalized tweets in archive order.
+
+    With `workers > 1` and more than one chunk of tweets, normalization is
+    spread over a process pool while the caller keeps writing on its own
+    thread. Only a few chunks per worker are in flight at once, and results
+    are consumed in submission order so "last occurrence wins" still holds.
+    """
+    chunks = _chunked(items, _NORMALIZE_CHUNK_SIZE)
+    first = next(chunks, None)
+    if first is None:
+        return
+    if workers <= 1 or len(first) < _NORMALIZE_CHUNK_SIZE:
+        yield from _iter_tweet_rows(
+            chain(first, chain.from_iterable(chunks)), owner_account_id, kind, include_media
+        )
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque[Future[list[_NormalizedTweet]]] = deque()
+        for chunk in chain((first,), chunks):
+            in_flight.append(
+                executor.submit(
+                    _normalize_tweets, chunk, owner_account_id, kind, include_media
+                )
+            )
+            if len(in_flight) > 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _get_owner_account_id(data: Mapping[str, Any]) -> Optional[str]:
+    accounts = data.get("account") or []
+    if isinstance(accounts, _ArchiveSection):
+        first = accounts.first()
+    else:
+        first = next(iter(accounts), None)
+    if first is None:
         return None
-    account = (account_list[0] or {}).get("account") or {}
+    account = (first or {}).get("account") or {}
     account_id = str(account.get("accountId", "")).strip()
     return account_id or None
 
 
-def _has_owner_scoped_data(data: dict[str, Any]) -> bool:
+def _has_owner_scoped_data(data: Mapping[str, Any]) -> bool:
     for key in (
         "upload-options",
         "profile",
@@ -233,14 +865,103 @@ def _has_owner_scoped_data(data: dict[str, Any]) -> bool:
             return True
         if isinstance(value, dict) and value:
             return True
+        if isinstance(value, _ArchiveSection) and value.first() is not None:
+            return True
     return False
 
 
+def _is_empty_database(session: Session) -> bool:
+    # Every owner-scoped row hangs off an imported account, so an empty account
+    # table (and no stray tweets) means nothing can collide with this import.
+    for column in (Account.account_id, Tweet.tweet_id):
+        if session.exec(select(column).limit(1)).first() is not None:
+            return False
+    return True
+
+
 def import_archive_data(
-    data: dict[str, Any],
+    data: Mapping[str, Any] | str | Path,
     session: Session,
     *,
     batch_size: int = 1000,
+    fresh_import: bool = False,
+    workers: int = 1,
+) -> dict[str, int]:
+    """
+    Import a parsed archive into `session` as a single transaction.
+
+    Staged rows are flushed every `batch_size` records so memory stays bounded,
+    but nothing is committed until the whole archive has been written; a failed
+    import is rolled back.
+
+    With `fresh_import=True` the caller guarantees the tweet, entity, note,
+    like, follower, and following tables hold no rows for this archive, so
+    the existence lookups are skipped; keys repeated within the archive
+    itself are still deduplicated. Non-unique secondary indexes are also
+    dropped for the load and rebuilt once at the end, which makes this the
+    fastest way to fill an empty database (`import_archive` turns it on
+    whenever the target database is empty).
+
+    With `workers > 1`, tweet and entity rows are normalized in that many
+    worker processes; all database writes still happen on this thread.
+
+    `data` may also be the path of an archive.json file or a twitter.com ZIP
+    export; large JSON archives are then streamed section by section.
+    """
+    if isinstance(data, (str, Path)):
+        data = _open_archive(Path(data))
+    dropped_indexes = _drop_secondary_indexes(session) if fresh_import else []
+    try:
+        # Existence lookups must not flush every pending insert; writes are
+        # flushed at batch boundaries instead, and repeated keys are tracked in
+        # memory.
+        with session.no_autoflush:
+            counts = _import_archive_data(
+                data,
+                session,
+                batch_size=batch_size,
+                fresh_import=fresh_import,
+                workers=workers,
+            )
+        session.commit()
+    except BaseException:
+        # KeyboardInterrupt included: the index rebuild below commits, and must
+        # not take a partial load with it.
+        session.rollback()
+        raise
+    finally:
+        if dropped_indexes:
+            _create_indexes(session, dropped_indexes)
+    return counts
+
+
+def _drop_secondary_indexes(session: Session) -> list[Index]:
+    connection = session.connection()
+    dropped: list[Index] = []
+    for table_name in _BULK_LOAD_TABLES:
+        for index in SQLModel.metadata.tables[table_name].indexes:
+            if index.unique:
+                continue
+            index.drop(connection, checkfirst=True)
+            dropped.append(index)
+    session.commit()
+    return dropped
+
+
+def _create_indexes(session: Session, indexes: list[Index]) -> None:
+    connection = session.connection()
+    for index in indexes:
+        index.create(connection, checkfirst=True)
+    session.commit()
+
+
+def _import_archive_data(
+    data: Mapping[str, Any],
+    session: Session,
+    *,
+    batch_size: int,
+    fresh_import: bool,
+    workers: int,
 ) -> dict[str, int]:
     counts = {
         "upload_options": 0,
@@ -265,58 +986,198 @@ def import_archive_data(
             "Archive owner account id is required to import owner-scoped data."
         )
     ensure_tweet_fts(session)
+    migrate_tweet_fts_rowids(session)
 
-    def commit_if_needed(counter: int) -> None:
+    # Keys already written by this import. Autoflush is off, so these stand in
+    # for the database when an archive repeats a key.
+    seen_keys: defaultdict[Any, set[Any]] = defaultdict(set)
+
+    def is_seen(kind: Any, key: Any) -> bool:
+        bucket = seen_keys[kind]
+        if key in bucket:
+            return True
+        bucket.add(key)
+        return False
+
+    # New rows skip the ORM constructor and go out as one executemany INSERT
+    # per table. Tweets are keyed first so parents land before their children.
+    pending_rows: dict[type[SQLModel], list[dict[str, Any]]] = {Tweet: []}
+
+    def stage_row(model: type[SQLModel], row: dict[str, Any]) -> None:
+        pending_rows.setdefault(model, []).append(row)
+
+    def flush_pending_rows() -> None:
+        for model, rows in pending_rows.items():
+            if not rows:
+                continue
+            if model is Tweet:
+                # Each tweet section is flushed before the next one starts, so
+                # a batch only ever holds tweets of one kind.
+                statement = _TWEET_UPSERT_STATEMENTS[rows[0]["tweet_kind"]]
+            else:
+                statement = _BULK_INSERT_STATEMENTS[model]
+            session.exec(statement, params=rows)
+            rows.clear()
+
+    # Entity rows are staged per batch so existing keys can be fetched in bulk.
+    child_rows: list[_EntityRow] = []
+    reimported_tweet_ids: list[str] = []
+
+    # Tweets not written earlier in this import, with the count they add to
+    # if new. On a reimport their stored owners are fetched once per batch.
+    unresolved_tweets: list[tuple[str, str]] = []
+
+    def stage_tweet(tweet_id: str, row: dict[str, Any], count_key: str) -> None:
+        if not is_seen(Tweet, tweet_id):
+            if fresh_import:
+                counts[count_key] += 1
+            else:
+                unresolved_tweets.append((tweet_id, count_key))
+        stage_row(Tweet, row)
+        fts_tweet_ids.add(tweet_id)
+
+    def resolve_tweet_owners() -> None:
+        if not unresolved_tweets:
+            return
+        tweet_ids = [tweet_id for tweet_id, _ in unresolved_tweets]
+        stored_owners: dict[str, str] = {}
+        for start in range(0, len(tweet_ids), _IN_CLAUSE_CHUNK_SIZE):
+            chunk = tweet_ids[start : start + _IN_CLAUSE_CHUNK_SIZE]
+            stored_owners.update(
+                session.exec(_TWEET_OWNERS_STATEMENT, params={"tweet_ids": chunk}).all()
+            )
+        for tweet_id, count_key in unresolved_tweets:
+            existing_owner = stored_owners.get(tweet_id)
+            if existing_owner is None:
+                counts[count_key] += 1
+            elif existing_owner != owner_account_id:
+                raise ValueError(
+                    "Tweet id collision across owners. "
+                    f"tweet_id={tweet_id!r}, "
+                    f"existing_owner_account_id={existing_owner!r}, "
+                    f"new_owner_account_id={owner_account_id!r}."
+                )
+            else:
+                reimported_tweet_ids.append(tweet_id)
+        unresolved_tweets.clear()
+
+    def flush_child_rows() -> None:
+        # Must run before the batch's tweets are written.
+        resolve_tweet_owners()
+        if reimported_tweet_ids and child_rows:
+            # Only tweets already in the database can have stored entities.
+            for model in {model for model, _, _ in child_rows}:
+                seen_keys[model].update(
+                    _fetch_child_keys(session, model, reimported_tweet_ids)
+                )
+        reimported_tweet_ids.clear()
+        for model, key, child_row in child_rows:
+            if is_seen(model, key):
+                continue
+            stage_row(model, child_row)
+            counts[_CHILD_COUNT_KEYS[model]] += 1
+        child_rows.clear()
+
+    # Notes, likes and follow edges are upserted in bulk; when an archive
+    # repeats a key, its last occurrence wins.
+    pending_upserts: dict[type[SQLModel], dict[str, dict[str, Any]]] = {}
+
+    def stage_upsert(model: type[SQLModel], key: str, row: dict[str, Any]) -> None:
+        pending_upserts.setdefault(model, {})[key] = row
+
+    # The owner's stored keys for each owner-scoped table are loaded into the
+    # seen sets once, so counting new rows is a set lookup rather than a query.
+    # Globally unique keys (note ids) are looked up per batch instead, so a
+    # note stored under another owner is not counted as new.
+    prefetched_owner_keys: set[type[SQLModel]] = set()
+
+    def flush_upserts() -> None:
+        for model, rows_by_key in pending_upserts.items():
+            if not rows_by_key:
+                continue
+            if fresh_import:
+                # Nothing is stored yet; only in-archive repeats need the seen set.
+                pass
+            elif model in _GLOBAL_KEY_STATEMENTS:
+                seen = seen_keys[model]
+                unseen = [key for key in rows_by_key if key not in seen]
+                seen.update(_fetch_global_keys(session, model, unseen))
+            elif model not in prefetched_owner_keys:
+                seen_keys[model].update(
+                    _fetch_owner_keys(session, model, owner_account_id)
+                )
+                prefetched_owner_keys.add(model)
+            counts[_UPSERT_COUNT_KEYS[model]] += sum(
+                1 for key in rows_by_key if not is_seen(model, key)
+            )
+            session.exec(_UPSERT_STATEMENTS[model], params=list(rows_by_key.values()))
+            rows_by_key.clear()
+
+    # FTS rows are copied from the written tweets once per batch, so a tweet
+    # repeated within the batch is indexed once with its final text.
+    fts_tweet_ids: set[str] = set()
+
+    def flush_fts_rows() -> None:
+        if fts_tweet_ids:
+            sync_tweet_fts_from_tweets(session, fts_tweet_ids)
+            fts_tweet_ids.clear()
+
+    def flush_if_needed(counter: int) -> None:
         if counter % batch_size == 0:
-            session.commit()
+            flush_child_rows()
+            flush_pending_rows()
+            flush_upserts()
+            flush_fts_rows()
+            session.flush()
 
     upload_options = data.get("upload-options")
     if isinstance(upload_options, dict) and owner_account_id is not None:
-        existing = session.exec(
-            select(UploadOptions)
-            .where(UploadOptions.account_id == owner_account_id)
-            .limit(1)
+        values = {
+            "keep_private": bool(upload_options.get("keepPrivate")),
+            "upload_likes": bool(upload_options.get("uploadLikes")),
+            "start_date": str(upload_options.get("startDate", _EMPTY)),
+            "end_date": str(upload_options.get("endDate", _EMPTY)),
+        }
+        # Only the id is needed to tell an insert from an update, so the
+        # existing row is never loaded into the session.
+        existing_id = session.exec(
+            select(UploadOptions.id).where(UploadOptions.account_id == owner_account_id)
         ).first()
-        if existing is None:
-            session.add(
-                UploadOptions(
-                    account_id=owner_account_id,
-                    keep_private=bool(upload_options.get("keepPrivate")),
-                    upload_likes=bool(upload_options.get("uploadLikes")),
-                    start_date=str(upload_options.get("startDate", "")),
-                    end_date=str(upload_options.get("endDate", "")),
-                )
-            )
+        if existing_id is None:
+            session.exec(insert(UploadOptions).values(account_id=owner_account_id, **values))
             counts["upload_options"] += 1
         else:
-            existing.keep_private = bool(upload_options.get("keepPrivate"))
-            existing.upload_likes = bool(upload_options.get("uploadLikes"))
-            existing.start_date = str(upload_options.get("startDate", ""))
-            existing.end_date = str(upload_options.get("endDate", ""))
+            session.exec(
+                update(UploadOptions)
+                .where(col(UploadOptions.id) == existing_id)
+                .values(**values)
+            )
 
+    # Account and profile rows are written with Core statements as well; each
+    # statement runs immediately, so a key repeated later in the archive sees
+    # the earlier write without an ORM flush.
     account_list = data.get("account") or []
     for item in account_list:
         account = item.get("account") or {}
-        account_id = str(account.get("accountId", ""))
+        account_id = str(account.get("accountId", _EMPTY))
         if not account_id:
             continue
-        existing = session.get(Account, account_id)
-        if existing is None:
-            session.add(
-                Account(
-                    account_id=account_id,
-                    username=str(account.get("username", "")),
-                    account_display_name=str(account.get("accountDisplayName", "")),
-                    created_at=str(account.get("createdAt", "")),
-                    created_via=str(account.get("createdVia", "")),
-                )
-            )
+        values = {
+            "username": str(account.get("username", _EMPTY)),
+            "account_display_name": str(account.get("accountDisplayName", _EMPTY)),
+            "created_at": str(account.get("createdAt", _EMPTY)),
+            "created_via": str(account.get("createdVia", _EMPTY)),
+        }
+        existing_id = session.exec(
+            select(Account.account_id).where(Account.account_id == account_id)
+        ).first()
+        if existing_id is None:
+            session.exec(insert(Account).values(account_id=account_id, **values))
             counts["account"] += 1
         else:
-            existing.username = str(account.get("username", ""))
-            existing.account_display_name = str(account.get("accountDisplayName", ""))
-            existing.created_at = str(account.get("createdAt", ""))
-            existing.created_via = str(account.get("createdVia", ""))
+            session.exec(
+                update(Account).where(col(Account.account_id) == account_id).values(**values)
+            )
 
     profile_list = data.get("profile") or []
     for item in profile_list:
@@ -324,725 +1185,154 @@ def import_archive_data(
         description = profile.get("description") or {}
         if owner_account_id is None:
             continue
-        existing = session.get(Profile, owner_account_id)
-        if existing is None:
-            session.add(
-                Profile(
-                    account_id=owner_account_id,
-                    bio=str(description.get("bio", "")),
-                    website=str(description.get("website", "")),
-                    location=str(description.get("location", "")),
-                    avatar_media_url=str(profile.get("avatarMediaUrl", "")),
-                    header_media_url=str(profile.get("headerMediaUrl", "")),
-                )
-            )
+        values = {
+            "bio": str(description.get("bio", _EMPTY)),
+            "website": str(description.get("website", _EMPTY)),
+            "location": str(description.get("location", _EMPTY)),
+            "avatar_media_url": str(profile.get("avatarMediaUrl", _EMPTY)),
+            "header_media_url": str(profile.get("headerMediaUrl", _EMPTY)),
+        }
+        existing_id = session.exec(
+            select(Profile.account_id).where(Profile.account_id == owner_account_id)
+        ).first()
+        if existing_id is None:
+            session.exec(insert(Profile).values(account_id=owner_account_id, **values))
             counts["profile"] += 1
         else:
-            existing.bio = str(description.get("bio", ""))
-            existing.website = str(description.get("website", ""))
-            existing.location = str(description.get("location", ""))
-            existing.avatar_media_url = str(profile.get("avatarMediaUrl", ""))
-            existing.header_media_url = str(profile.get("headerMediaUrl", ""))
-
-    tweet_counter = 0
-    for item in data.get("tweets") or []:
-        tweet = item.get("tweet") or {}
-        tweet_id = str(tweet.get("id", ""))
-        if not tweet_id:
-            continue
-        if owner_account_id is None:
-            continue
-        display_text_range = tweet.get("display_text_range")
-        existing = session.get(Tweet, tweet_id)
-        if existing is not None and existing.account_id != owner_account_id:
-            raise ValueError(
-                "Tweet id collision across owners. "
-                f"tweet_id={tweet_id!r}, "
-                f"existing_owner_account_id={existing.account_id!r}, "
-                f"new_owner_account_id={owner_account_id!r}."
-            )
-        if existing is None:
-            session.add(
-                Tweet(
-                    tweet_id=tweet_id,
-                    account_id=owner_account_id,
-                    tweet_id_str=str(tweet.get("id_str", "")) or None,
-                    tweet_kind="tweet",
-                    created_at=_parse_archive_datetime(tweet.get("created_at")),
-                    full_text=str(tweet.get("full_text", "")),
-                    lang=str(tweet.get("lang", "")),
-                    source=str(tweet.get("source", "")),
-                    retweeted=bool(tweet.get("retweeted")),
-                    favorited=bool(tweet.get("favorited")),
-                    truncated=bool(tweet.get("truncated")),
-                    favorite_count=_safe_int(tweet.get("favorite_count")),
-                    retweet_count=_safe_int(tweet.get("retweet_count")),
-                    display_text_range=(
-                        [v for v in (_safe_int(x) for x in display_text_range or []) if v is not None]
-                        if display_text_range is not None
-                        else None
-                    ),
-                    in_reply_to_status_id=(
-                        str(tweet.get("in_reply_to_status_id"))
-                        if tweet.get("in_reply_to_status_id") is not None
-                        else None
-                    ),
-                    in_reply_to_status_id_str=(
-                        str(tweet.get("in_reply_to_status_id_str"))
-                        if tweet.get("in_reply_to_status_id_str") is not None
-                        else None
-                    ),
-                    in_reply_to_user_id=(
-                        str(tweet.get("in_reply_to_user_id"))
-                        if tweet.get("in_reply_to_user_id") is not None
-                        else None
-                    ),
-                    in_reply_to_user_id_str=(
-                        str(tweet.get("in_reply_to_user_id_str"))
-                        if tweet.get("in_reply_to_user_id_str") is not None
-                        else None
-                    ),
-                    in_reply_to_screen_name=(
-                        str(tweet.get("in_reply_to_screen_name"))
-                        if tweet.get("in_reply_to_screen_name") is not None
-                        else None
-                    ),
-                    possibly_sensitive=(
-                        bool(tweet.get("possibly_sensitive"))
-                        if tweet.get("possibly_sensitive") is not None
-                        else None
-                    ),
-                    edit_info=tweet.get("edit_info"),
-                )
-            )
-            counts["tweet"] += 1
-        else:
-            existing.account_id = owner_account_id
-            existing.tweet_id_str = str(tweet.get("id_str", "")) or None
-            existing.tweet_kind = "tweet"
-            existing.created_at = _parse_archive_datetime(tweet.get("created_at"))
-            existing.full_text = str(tweet.get("full_text", ""))
-            existing.lang = str(tweet.get("lang", ""))
-            existing.source = str(tweet.get("source", ""))
-            existing.retweeted = bool(tweet.get("retweeted"))
-            existing.favorited = bool(tweet.get("favorited"))
-            existing.truncated = bool(tweet.get("truncated"))
-            existing.favorite_count = _safe_int(tweet.get("favorite_count"))
-            existing.retweet_count = _safe_int(tweet.get("retweet_count"))
-            existing.display_text_range = (
-                [v for v in (_safe_int(x) for x in display_text_range or []) if v is not None]
-                if display_text_range is not None
-                else None
-            )
-            existing.in_reply_to_status_id = (
-                str(tweet.get("in_reply_to_status_id"))
-                if tweet.get("in_reply_to_status_id") is not None
-                else None
-            )
-            existing.in_reply_to_status_id_str = (
-                str(tweet.get("in_reply_to_status_id_str"))
-                if tweet.get("in_reply_to_status_id_str") is not None
-                else None
-            )
-            existing.in_reply_to_user_id = (
-                str(tweet.get("in_reply_to_user_id"))
-                if tweet.get("in_reply_to_user_id") is not None
-                else None
-            )
-            existing.in_reply_to_user_id_str = (
-                str(tweet.get("in_reply_to_user_id_str"))
-                if tweet.get("in_reply_to_user_id_str") is not None
-                else None
-            )
-            existing.in_reply_to_screen_name = (
-                str(tweet.get("in_reply_to_screen_name"))
-                if tweet.get("in_reply_to_screen_name") is not None
-                else None
-            )
-            existing.possibly_sensitive = (
-                bool(tweet.get("possibly_sensitive"))
-                if tweet.get("possibly_sensitive") is not None
-                else None
+            session.exec(
+                update(Profile)
+                .where(col(Profile.account_id) == owner_account_id)
+                .values(**values)
             )
-            existing.edit_info = tweet.get("edit_info")
 
-        sync_tweet_fts(
-            session,
-            tweet_id=tweet_id,
-            account_id=owner_account_id,
-            full_text=str(tweet.get("full_text", "")),
+    tweet_counter = 0
+    for tweet_id, row, entity_rows in (
+        _iter_normalized_tweets(
+            data.get("tweets") or [],
+            owner_account_id,
+            _KIND_TWEET,
+            include_media=True,
+            workers=workers,
         )
-
-        entities = tweet.get("entities") or {}
-        for hashtag in entities.get("hashtags") or []:
-            start_index, end_index = _indices_to_bounds(hashtag.get("indices") or [])
-            if not _exists(
-                session,
-                TweetHashtag,
-                [
-                    TweetHashtag.tweet_id == tweet_id,
-                    TweetHashtag.text == str(hashtag.get("text", "")),
-                    TweetHashtag.start_index == start_index,
-                    TweetHashtag.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetHashtag(
-                        tweet_id=tweet_id,
-                        text=str(hashtag.get("text", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_hashtag"] += 1
-
-        for symbol in entities.get("symbols") or []:
-            start_index, end_index = _indices_to_bounds(symbol.get("indices") or [])
-            if not _exists(
-                session,
-                TweetSymbol,
-                [
-                    TweetSymbol.tweet_id == tweet_id,
-                    TweetSymbol.text == str(symbol.get("text", "")),
-                    TweetSymbol.start_index == start_index,
-                    TweetSymbol.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetSymbol(
-                        tweet_id=tweet_id,
-                        text=str(symbol.get("text", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_symbol"] += 1
-
-        for mention in entities.get("user_mentions") or []:
-            start_index, end_index = _indices_to_bounds(mention.get("indices") or [])
-            if not _exists(
-                session,
-                TweetUserMention,
-                [
-                    TweetUserMention.tweet_id == tweet_id,
-                    TweetUserMention.user_id == (str(mention.get("id", "")) or None),
-                    TweetUserMention.user_id_str == (str(mention.get("id_str", "")) or None),
-                    TweetUserMention.name == str(mention.get("name", "")),
-                    TweetUserMention.screen_name == str(mention.get("screen_name", "")),
-                    TweetUserMention.start_index == start_index,
-                    TweetUserMention.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetUserMention(
-                        tweet_id=tweet_id,
-                        user_id=str(mention.get("id", "")) or None,
-                        user_id_str=str(mention.get("id_str", "")) or None,
-                        name=str(mention.get("name", "")),
-                        screen_name=str(mention.get("screen_name", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_user_mention"] += 1
-
-        for url in entities.get("urls") or []:
-            start_index, end_index = _indices_to_bounds(url.get("indices") or [])
-            if not _exists(
-                session,
-                TweetUrl,
-                [
-                    TweetUrl.tweet_id == tweet_id,
-                    TweetUrl.url == str(url.get("url", "")),
-                    TweetUrl.expanded_url == str(url.get("expanded_url", "")),
-                    TweetUrl.display_url == str(url.get("display_url", "")),
-                    TweetUrl.start_index == start_index,
-                    TweetUrl.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetUrl(
-                        tweet_id=tweet_id,
-                        url=str(url.get("url", "")),
-                        expanded_url=str(url.get("expanded_url", "")),
-                        display_url=str(url.get("display_url", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_url"] += 1
-
-        for media in entities.get("media") or []:
-            start_index, end_index = _indices_to_bounds(media.get("indices") or [])
-            if not _exists(
-                session,
-                TweetMedia,
-                [
-                    TweetMedia.tweet_id == tweet_id,
-                    TweetMedia.entity_type == "entities",
-                    TweetMedia.media_id == (str(media.get("id", "")) or None),
-                    TweetMedia.media_id_str == (str(media.get("id_str", "")) or None),
-                    TweetMedia.url == str(media.get("url", "")),
-                    TweetMedia.media_url == str(media.get("media_url", "")),
-                ],
-            ):
-                session.add(
-                    TweetMedia(
-                        tweet_id=tweet_id,
-                        entity_type="entities",
-                        media_id=str(media.get("id", "")) or None,
-                        media_id_str=str(media.get("id_str", "")) or None,
-                        media_type=str(media.get("type", "")),
-                        url=str(media.get("url", "")),
-                        expanded_url=str(media.get("expanded_url", "")),
-                        display_url=str(media.get("display_url", "")),
-                        media_url=str(media.get("media_url", "")),
-                        media_url_https=str(media.get("media_url_https", "")),
-                        sizes=media.get("sizes"),
-                        source_status_id=(
-                            str(media.get("source_status_id"))
-                            if media.get("source_status_id") is not None
-                            else None
-                        ),
-                        source_status_id_str=(
-                            str(media.get("source_status_id_str"))
-                            if media.get("source_status_id_str") is not None
-                            else None
-                        ),
-                        source_user_id=(
-                            str(media.get("source_user_id"))
-                            if media.get("source_user_id") is not None
-                            else None
-                        ),
-                        source_user_id_str=(
-                            str(media.get("source_user_id_str"))
-                            if media.get("source_user_id_str") is not None
-                            else None
-                        ),
-                    )
-                )
-                counts["tweet_media"] += 1
-
-        extended = tweet.get("extended_entities") or {}
-        for media in extended.get("media") or []:
-            start_index, end_index = _indices_to_bounds(media.get("indices") or [])
-            if not _exists(
-                session,
-                TweetMedia,
-                [
-                    TweetMedia.tweet_id == tweet_id,
-                    TweetMedia.entity_type == "extended",
-                    TweetMedia.media_id == (str(media.get("id", "")) or None),
-                    TweetMedia.media_id_str == (str(media.get("id_str", "")) or None),
-                    TweetMedia.url == str(media.get("url", "")),
-                    TweetMedia.media_url == str(media.get("media_url", "")),
-                ],
-            ):
-                session.add(
-                    TweetMedia(
-                        tweet_id=tweet_id,
-                        entity_type="extended",
-                        media_id=str(media.get("id", "")) or None,
-                        media_id_str=str(media.get("id_str", "")) or None,
-                        media_type=str(media.get("type", "")),
-                        url=str(media.get("url", "")),
-                        expanded_url=str(media.get("expanded_url", "")),
-                        display_url=str(media.get("display_url", "")),
-                        media_url=str(media.get("media_url", "")),
-                        media_url_https=str(media.get("media_url_https", "")),
-                        sizes=media.get("sizes"),
-                        video_info=media.get("video_info"),
-                        additional_media_info=media.get("additional_media_info"),
-                        source_status_id=(
-                            str(media.get("source_status_id"))
-                            if media.get("source_status_id") is not None
-                            else None
-                        ),
-                        source_status_id_str=(
-                            str(media.get("source_status_id_str"))
-                            if media.get("source_status_id_str") is not None
-                            else None
-                        ),
-                        source_user_id=(
-                            str(media.get("source_user_id"))
-                            if media.get("source_user_id") is not None
-                            else None
-                        ),
-                        source_user_id_str=(
-                            str(media.get("source_user_id_str"))
-                            if media.get("source_user_id_str") is not None
-                            else None
-                        ),
-                    )
-                )
-                counts["tweet_media"] += 1
+        if owner_account_id is not None
+        else ()
+    ):
+        stage_tweet(tweet_id, row, "tweet")
+        child_rows.extend(entity_rows)
 
         tweet_counter += 1
-        commit_if_needed(tweet_counter)
+        flush_if_needed(tweet_counter)
+    flush_child_rows()
+    flush_pending_rows()
+    flush_fts_rows()
 
     community_counter = 0
-    for item in data.get("community-tweet") or []:
-        tweet = item.get("tweet") or {}
-        tweet_id = str(tweet.get("id", ""))
-        if not tweet_id:
-            continue
-        if owner_account_id is None:
-            continue
-        display_text_range = tweet.get("display_text_range")
-        existing = session.get(Tweet, tweet_id)
-        if existing is not None and existing.account_id != owner_account_id:
-            raise ValueError(
-                "Tweet id collision across owners. "
-                f"tweet_id={tweet_id!r}, "
-                f"existing_owner_account_id={existing.account_id!r}, "
-                f"new_owner_account_id={owner_account_id!r}."
-            )
-        if existing is None:
-            session.add(
-                Tweet(
-                    tweet_id=tweet_id,
-                    account_id=owner_account_id,
-                    tweet_id_str=str(tweet.get("id_str", "")) or None,
-                    tweet_kind="community",
-                    created_at=_parse_archive_datetime(tweet.get("created_at")),
-                    full_text=str(tweet.get("full_text", "")),
-                    lang=str(tweet.get("lang", "")),
-                    source=str(tweet.get("source", "")),
-                    retweeted=bool(tweet.get("retweeted")),
-                    favorited=bool(tweet.get("favorited")),
-                    truncated=bool(tweet.get("truncated")),
-                    favorite_count=_safe_int(tweet.get("favorite_count")),
-                    retweet_count=_safe_int(tweet.get("retweet_count")),
-                    display_text_range=(
-                        [v for v in (_safe_int(x) for x in display_text_range or []) if v is not None]
-                        if display_text_range is not None
-                        else None
-                    ),
-                    in_reply_to_status_id=(
-                        str(tweet.get("in_reply_to_status_id"))
-                        if tweet.get("in_reply_to_status_id") is not None
-                        else None
-                    ),
-                    in_reply_to_status_id_str=(
-                        str(tweet.get("in_reply_to_status_id_str"))
-                        if tweet.get("in_reply_to_status_id_str") is not None
-                        else None
-                    ),
-                    in_reply_to_user_id=(
-                        str(tweet.get("in_reply_to_user_id"))
-                        if tweet.get("in_reply_to_user_id") is not None
-                        else None
-                    ),
-                    in_reply_to_user_id_str=(
-                        str(tweet.get("in_reply_to_user_id_str"))
-                        if tweet.get("in_reply_to_user_id_str") is not None
-                        else None
-                    ),
-                    in_reply_to_screen_name=(
-                        str(tweet.get("in_reply_to_screen_name"))
-                        if tweet.get("in_reply_to_screen_name") is not None
-                        else None
-                    ),
-                    possibly_sensitive=(
-                        bool(tweet.get("possibly_sensitive"))
-                        if tweet.get("possibly_sensitive") is not None
-                        else None
-                    ),
-                    edit_info=tweet.get("edit_info"),
-                    community_id=str(tweet.get("community_id", "")) or None,
-                    community_id_str=str(tweet.get("community_id_str", "")) or None,
-                    scopes=tweet.get("scopes"),
-                )
-            )
-            counts["community_tweet"] += 1
-        else:
-            existing.account_id = owner_account_id
-            existing.tweet_id_str = str(tweet.get("id_str", "")) or None
-            existing.tweet_kind = "community"
-            existing.created_at = _parse_archive_datetime(tweet.get("created_at"))
-            existing.full_text = str(tweet.get("full_text", ""))
-            existing.lang = str(tweet.get("lang", ""))
-            existing.source = str(tweet.get("source", ""))
-            existing.retweeted = bool(tweet.get("retweeted"))
-            existing.favorited = bool(tweet.get("favorited"))
-            existing.truncated = bool(tweet.get("truncated"))
-            existing.favorite_count = _safe_int(tweet.get("favorite_count"))
-            existing.retweet_count = _safe_int(tweet.get("retweet_count"))
-            existing.display_text_range = (
-                [v for v in (_safe_int(x) for x in display_text_range or []) if v is not None]
-                if display_text_range is not None
-                else None
-            )
-            existing.in_reply_to_status_id = (
-                str(tweet.get("in_reply_to_status_id"))
-                if tweet.get("in_reply_to_status_id") is not None
-                else None
-            )
-            existing.in_reply_to_status_id_str = (
-                str(tweet.get("in_reply_to_status_id_str"))
-                if tweet.get("in_reply_to_status_id_str") is not None
-                else None
-            )
-            existing.in_reply_to_user_id = (
-                str(tweet.get("in_reply_to_user_id"))
-                if tweet.get("in_reply_to_user_id") is not None
-                else None
-            )
-            existing.in_reply_to_user_id_str = (
-                str(tweet.get("in_reply_to_user_id_str"))
-                if tweet.get("in_reply_to_user_id_str") is not None
-                else None
-            )
-            existing.in_reply_to_screen_name = (
-                str(tweet.get("in_reply_to_screen_name"))
-                if tweet.get("in_reply_to_screen_name") is not None
-                else None
-            )
-            existing.possibly_sensitive = (
-                bool(tweet.get("possibly_sensitive"))
-                if tweet.get("possibly_sensitive") is not None
-                else None
-            )
-            existing.edit_info = tweet.get("edit_info")
-            existing.community_id = str(tweet.get("community_id", "")) or None
-            existing.community_id_str = str(tweet.get("community_id_str", "")) or None
-            existing.scopes = tweet.get("scopes")
-
-        sync_tweet_fts(
-            session,
-            tweet_id=tweet_id,
-            account_id=owner_account_id,
-            full_text=str(tweet.get("full_text", "")),
+    for tweet_id, row, entity_rows in (
+        _iter_normalized_tweets(
+            data.get("community-tweet") or [],
+            owner_account_id,
+            _KIND_COMMUNITY,
+            include_media=False,
+            workers=workers,
         )
-
-        entities = tweet.get("entities") or {}
-        for hashtag in entities.get("hashtags") or []:
-            start_index, end_index = _indices_to_bounds(hashtag.get("indices") or [])
-            if not _exists(
-                session,
-                TweetHashtag,
-                [
-                    TweetHashtag.tweet_id == tweet_id,
-                    TweetHashtag.text == str(hashtag.get("text", "")),
-                    TweetHashtag.start_index == start_index,
-                    TweetHashtag.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetHashtag(
-                        tweet_id=tweet_id,
-                        text=str(hashtag.get("text", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_hashtag"] += 1
-
-        for symbol in entities.get("symbols") or []:
-            start_index, end_index = _indices_to_bounds(symbol.get("indices") or [])
-            if not _exists(
-                session,
-                TweetSymbol,
-                [
-                    TweetSymbol.tweet_id == tweet_id,
-                    TweetSymbol.text == str(symbol.get("text", "")),
-                    TweetSymbol.start_index == start_index,
-                    TweetSymbol.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetSymbol(
-                        tweet_id=tweet_id,
-                        text=str(symbol.get("text", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_symbol"] += 1
-
-        for mention in entities.get("user_mentions") or []:
-            start_index, end_index = _indices_to_bounds(mention.get("indices") or [])
-            if not _exists(
-                session,
-                TweetUserMention,
-                [
-                    TweetUserMention.tweet_id == tweet_id,
-                    TweetUserMention.user_id == (str(mention.get("id", "")) or None),
-                    TweetUserMention.user_id_str == (str(mention.get("id_str", "")) or None),
-                    TweetUserMention.name == str(mention.get("name", "")),
-                    TweetUserMention.screen_name == str(mention.get("screen_name", "")),
-                    TweetUserMention.start_index == start_index,
-                    TweetUserMention.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetUserMention(
-                        tweet_id=tweet_id,
-                        user_id=str(mention.get("id", "")) or None,
-                        user_id_str=str(mention.get("id_str", "")) or None,
-                        name=str(mention.get("name", "")),
-                        screen_name=str(mention.get("screen_name", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_user_mention"] += 1
-
-        for url in entities.get("urls") or []:
-            start_index, end_index = _indices_to_bounds(url.get("indices") or [])
-            if not _exists(
-                session,
-                TweetUrl,
-                [
-                    TweetUrl.tweet_id == tweet_id,
-                    TweetUrl.url == str(url.get("url", "")),
-                    TweetUrl.expanded_url == str(url.get("expanded_url", "")),
-                    TweetUrl.display_url == str(url.get("display_url", "")),
-                    TweetUrl.start_index == start_index,
-                    TweetUrl.end_index == end_index,
-                ],
-            ):
-                session.add(
-                    TweetUrl(
-                        tweet_id=tweet_id,
-                        url=str(url.get("url", "")),
-                        expanded_url=str(url.get("expanded_url", "")),
-                        display_url=str(url.get("display_url", "")),
-                        start_index=start_index,
-                        end_index=end_index,
-                    )
-                )
-                counts["tweet_url"] += 1
+        if owner_account_id is not None
+        else ()
+    ):
+        stage_tweet(tweet_id, row, "community_tweet")
+        child_rows.extend(entity_rows)
 
         community_counter += 1
-        commit_if_needed(community_counter)
+        flush_if_needed(community_counter)
+    flush_child_rows()
+    flush_pending_rows()
+    flush_fts_rows()
 
     note_counter = 0
     for item in data.get("note-tweet") or []:
         note = item.get("noteTweet") or {}
-        note_id = str(note.get("noteTweetId", ""))
+        note_id = str(note.get("noteTweetId", _EMPTY))
         if not note_id:
             continue
         if owner_account_id is None:
             continue
-        existing = session.get(NoteTweet, note_id)
-        if existing is None:
-            session.add(
-                NoteTweet(
-                    note_tweet_id=note_id,
-                    account_id=owner_account_id,
-                    created_at=str(note.get("createdAt", "")),
-                    updated_at=str(note.get("updatedAt", "")),
-                    lifecycle=note.get("lifecycle") or {},
-                    core=note.get("core") or {},
-                )
-            )
-            counts["note_tweet"] += 1
-        else:
-            existing.account_id = owner_account_id
-            existing.created_at = str(note.get("createdAt", ""))
-            existing.updated_at = str(note.get("updatedAt", ""))
-            existing.lifecycle = note.get("lifecycle") or {}
-            existing.core = note.get("core") or {}
+        stage_upsert(
+            NoteTweet,
+            note_id,
+            {
+                "note_tweet_id": note_id,
+                "account_id": owner_account_id,
+                "created_at": str(note.get("createdAt", _EMPTY)),
+                "updated_at": str(note.get("updatedAt", _EMPTY)),
+                "lifecycle": note.get("lifecycle") or {},
+                "core": note.get("core") or {},
+            },
+        )
         note_counter += 1
-        commit_if_needed(note_counter)
+        flush_if_needed(note_counter)
 
     like_counter = 0
     for item in data.get("like") or []:
         like = item.get("like") or {}
-        tweet_id = str(like.get("tweetId", ""))
+        tweet_id = str(like.get("tweetId", _EMPTY))
         if not tweet_id:
             continue
         if owner_account_id is None:
             continue
-        existing = session.exec(
-            select(Like)
-            .where(
-                Like.account_id == owner_account_id,
-                Like.tweet_id == tweet_id,
-            )
-            .limit(1)
-        ).first()
-        if existing is None:
-            session.add(
-                Like(
-                    account_id=owner_account_id,
-                    tweet_id=tweet_id,
-                    full_text=like.get("fullText"),
-                    expanded_url=like.get("expandedUrl"),
-                )
-            )
-            counts["like"] += 1
-        else:
-            existing.account_id = owner_account_id
-            existing.full_text = like.get("fullText")
-            existing.expanded_url = like.get("expandedUrl")
+        stage_upsert(
+            Like,
+            tweet_id,
+            {
+                "account_id": owner_account_id,
+                "tweet_id": tweet_id,
+                "full_text": like.get("fullText"),
+                "expanded_url": like.get("expandedUrl"),
+            },
+        )
         like_counter += 1
-        commit_if_needed(like_counter)
+        flush_if_needed(like_counter)
 
     follower_counter = 0
     for item in data.get("follower") or []:
         follower = item.get("follower") or {}
-        follower_account_id = str(follower.get("accountId", ""))
+        follower_account_id = str(follower.get("accountId", _EMPTY))
         if not follower_account_id:
             continue
         if owner_account_id is None:
             continue
-        user_link = str(follower.get("userLink", ""))
-        existing = session.exec(
-            select(Follower)
-            .where(
-                Follower.account_id == owner_account_id,
-                Follower.follower_account_id == follower_account_id,
-            )
-            .limit(1)
-        ).first()
-        if existing is None:
-            session.add(
-                Follower(
-                    account_id=owner_account_id,
-                    follower_account_id=follower_account_id,
-                    user_link=user_link,
-                )
-            )
-            counts["follower"] += 1
-        else:
-            existing.user_link = user_link
+        stage_upsert(
+            Follower,
+            follower_account_id,
+            {
+                "account_id": owner_account_id,
+                "follower_account_id": follower_account_id,
+                "user_link": str(follower.get("userLink", _EMPTY)),
+            },
+        )
         follower_counter += 1
-        commit_if_needed(follower_counter)
+        flush_if_needed(follower_counter)
 
     following_counter = 0
     for item in data.get("following") or []:
         following = item.get("following") or {}
-        followed_account_id = str(following.get("accountId", ""))
+        followed_account_id = str(following.get("accountId", _EMPTY))
         if not followed_account_id:
             continue
         if owner_account_id is None:
             continue
-        user_link = str(following.get("userLink", ""))
-        existing = session.exec(
-            select(Following)
-            .where(
-                Following.account_id == owner_account_id,
-                Following.followed_account_id == followed_account_id,
-            )
-            .limit(1)
-        ).first()
-        if existing is None:
-            session.add(
-                Following(
-                    account_id=owner_account_id,
-                    followed_account_id=followed_account_id,
-                    user_link=user_link,
-                )
-            )
-            counts["following"] += 1
-        else:
-            existing.user_link = user_link
+        stage_upsert(
+            Following,
+            followed_account_id,
+            {
+                "account_id": owner_account_id,
+                "followed_account_id": followed_account_id,
+                "user_link": str(following.get("userLink", _EMPTY)),
+            },
+        )
         following_counter += 1
-        commit_if_needed(following_counter)
+        flush_if_needed(following_counter)
 
-    session.commit()
+    flush_pending_rows()
+    flush_upserts()
     return counts
 
 
@@ -1053,6 +1343,7 @@ def import_archive(
     url: Optional[str] = None,
     path: Optional[str | Path] = None,
     batch_size: int = 1000,
+    workers: int = 1,
 ) -> dict[str, int]:
     if not db_url:
         db_url = get_default_db_url()
@@ -1063,18 +1354,25 @@ def import_archive(
         elif path is None:
             raise ValueError("Provide username, url, or path.")
 
-    if url:
-        data = download_archive(url)
-    else:
-        if path is None:
-            raise ValueError("Provide username, url, or path.")
-        path_obj = Path(path)
-        if zipfile.is_zipfile(path_obj):
-            data = load_twitter_zip(path_obj)
+    with ExitStack() as stack:
+        data: Mapping[str, Any]
+        if url:
+            # Spool to disk so a large archive can be streamed by section.
+            download_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            data = _open_archive(_download_archive_file(url, download_dir / "archive.json"))
         else:
-            data = load_archive(path_obj)
-
-    engine = get_engine(db_url)
-    init_db(engine)
-    with get_session(engine) as session:
-        return import_archive_data(data, session, batch_size=batch_size)
+            if path is None:
+                raise ValueError("Provide username, url, or path.")
+            data = _open_archive(Path(path))
+
+        engine = get_engine(db_url)
+        enable_bulk_load_pragmas(engine)
+        init_db(engine)
+        with get_session(engine) as session:
+            return import_archive_data(
+                data,
+                session,
+                batch_size=batch_size,
+                fresh_import=_is_empty_database(session),
+                workers=workers,
+            )
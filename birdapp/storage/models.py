@@ -116,11 +116,23 @@ class Tweet(SQLModel, table=True):
     media: list["TweetMedia"] = Relationship(back_populates="tweet")
 
 
+# Entity tables are looked up by their natural key, whose unique index leads
+# with tweet_id; that index also serves per-tweet scans, so tweet_id needs no
+# index of its own.
 class TweetHashtag(SQLModel, table=True):
     __tablename__ = "tweet_hashtag"
+    __table_args__ = (
+        UniqueConstraint(
+            "tweet_id",
+            "text",
+            "start_index",
+            "end_index",
+            name="uq_tweet_hashtag_natural_key",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    tweet_id: str = Field(foreign_key="tweet.tweet_id", index=True)
+    tweet_id: str = Field(foreign_key="tweet.tweet_id")
     text: str
     start_index: Optional[int] = None
     end_index: Optional[int] = None
@@ -130,9 +142,18 @@ class TweetHashtag(SQLModel, table=True):
 
 class TweetSymbol(SQLModel, table=True):
     __tablename__ = "tweet_symbol"
+    __table_args__ = (
+        UniqueConstraint(
+            "tweet_id",
+            "text",
+            "start_index",
+            "end_index",
+            name="uq_tweet_symbol_natural_key",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    tweet_id: str = Field(foreign_key="tweet.tweet_id", index=True)
+    tweet_id: str = Field(foreign_key="tweet.tweet_id")
     text: str
     start_index: Optional[int] = None
     end_index: Optional[int] = None
@@ -142,9 +163,21 @@ class TweetSymbol(SQLModel, table=True):
 
 class TweetUserMention(SQLModel, table=True):
     __tablename__ = "tweet_user_mention"
+    __table_args__ = (
+        UniqueConstraint(
+            "tweet_id",
+            "user_id",
+            "user_id_str",
+            "name",
+            "screen_name",
+            "start_index",
+            "end_index",
+            name="uq_tweet_user_mention_natural_key",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    tweet_id: str = Field(foreign_key="tweet.tweet_id", index=True)
+    tweet_id: str = Field(foreign_key="tweet.tweet_id")
     user_id: Optional[str] = Field(default=None, index=True)
     user_id_str: Optional[str] = Field(default=None, index=True)
     name: str
@@ -157,9 +190,20 @@ class TweetUserMention(SQLModel, table=True):
 
 class TweetUrl(SQLModel, table=True):
     __tablename__ = "tweet_url"
+    __table_args__ = (
+        UniqueConstraint(
+            "tweet_id",
+            "url",
+            "expanded_url",
+            "display_url",
+            "start_index",
+            "end_index",
+            name="uq_tweet_url_natural_key",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    tweet_id: str = Field(foreign_key="tweet.tweet_id", index=True)
+    tweet_id: str = Field(foreign_key="tweet.tweet_id")
     url: str
     expanded_url: str
     display_url: str
@@ -171,9 +215,20 @@ class TweetUrl(SQLModel, table=True):
 
 class TweetMedia(SQLModel, table=True):
     __tablename__ = "tweet_media"
+    __table_args__ = (
+        UniqueConstraint(
+            "tweet_id",
+            "entity_type",
+            "media_id",
+            "media_id_str",
+            "url",
+            "media_url",
+            name="uq_tweet_media_natural_key",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    tweet_id: str = Field(foreign_key="tweet.tweet_id", index=True)
+    tweet_id: str = Field(foreign_key="tweet.tweet_id")
     entity_type: str = Field(default="entities", index=True)
     media_id: Optional[str] = Field(default=None, index=True)
     media_id_str: Optional[str] = Field(default=None, index=True)
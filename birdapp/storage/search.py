@@ -1,15 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 from datetime import date, datetime, time, timezone
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
 
-from sqlalchemy import text
-from sqlmodel import Session, select
+from sqlalchemy import DateTime, Integer, String, bindparam, text
+from sqlmodel import Session
 
 from .db import get_default_db_url, get_engine, get_session, init_db
 from .dates import coerce_datetime, format_timestamp
-from .models import Account
 
 _TWEET_FTS_DDL = """
 CREATE VIRTUAL TABLE IF NOT EXISTS tweet_fts USING fts5(
@@ -20,6 +20,57 @@ CREATE VIRTUAL TABLE IF NOT EXISTS tweet_fts USING fts5(
 );
 """
 
+# FTS rows are keyed by a rowid derived from the tweet id, so a re-sync is a
+# single INSERT OR REPLACE instead of a scan on the unindexed tweet_id column.
+_TWEET_FTS_UPSERT = text(
+    "INSERT OR REPLACE INTO tweet_fts(rowid, tweet_id, account_id, full_text) "
+    "VALUES(:rowid, :tweet_id, :account_id, :full_text)"
+)
+_TWEET_FTS_UPSERT_FROM_TWEET = text(
+    "INSERT OR REPLACE INTO tweet_fts(rowid, tweet_id, account_id, full_text) "
+    "SELECT :rowid, tweet_id, account_id, full_text FROM tweet WHERE tweet_id = :tweet_id"
+)
+_TWEET_FTS_ROWID_BOUNDS = text(
+    "SELECT rowid, tweet_id FROM tweet_fts "
+    "WHERE rowid IN ((SELECT min(rowid) FROM tweet_fts), (SELECT max(rowid) FROM tweet_fts))"
+)
+_MAX_FTS_ROWID = 2**63 - 1
+
+# Author resolution happens in the subquery (first account with the username,
+# no match means no results), so a search is one round trip on one cached
+# statement.
+_SEARCH_STATEMENT = text(
+    """
+    SELECT
+      t.tweet_id,
+      a.account_id,
+      a.username,
+      a.account_display_name,
+      t.created_at,
+      t.full_text,
+      t.tweet_kind,
+      bm25(tweet_fts) AS rank
+    FROM tweet_fts
+    JOIN tweet t ON t.tweet_id = tweet_fts.tweet_id
+    JOIN account a ON a.account_id = t.account_id
+    WHERE tweet_fts MATCH :query
+      AND (
+        :username IS NULL
+        OR t.account_id = (SELECT account_id FROM account WHERE username = :username LIMIT 1)
+      )
+      AND (:since IS NULL OR t.created_at >= :since)
+      AND (:until IS NULL OR t.created_at <= :until)
+    ORDER BY rank ASC, t.created_at IS NULL, t.created_at DESC
+    LIMIT :limit;
+    """
+).bindparams(
+    bindparam("query", type_=String),
+    bindparam("username", type_=String),
+    bindparam("since", type_=DateTime),
+    bindparam("until", type_=DateTime),
+    bindparam("limit", type_=Integer),
+)
+
 
 @dataclass(frozen=True)
 class SearchOwner:
@@ -52,7 +103,44 @@ class SearchResult:
 
 
 def ensure_tweet_fts(session: Session) -> None:
-    session.exec(text(_TWEET_FTS_DDL))
+    session.connection().execute(text(_TWEET_FTS_DDL))
+
+
+def _tweet_fts_rowid(tweet_id: str) -> int:
+    """
+    Map a tweet id onto a stable FTS rowid.
+
+    Numeric ids are used as-is; anything else hashes to a negative rowid so it
+    can never collide with a numeric one.
+    """
+    if tweet_id.isdigit():
+        value = int(tweet_id)
+        if value <= _MAX_FTS_ROWID:
+            return value
+    digest = hashlib.blake2b(tweet_id.encode("utf-8"), digest_size=8).digest()
+    return -(int.from_bytes(digest, "big") >> 1) - 1
+
+
+def migrate_tweet_fts_rowids(session: Session) -> None:
+    """
+    Renumber FTS rows written before rowids were derived from tweet ids.
+
+    Only the lowest and highest rowids are checked, which is enough to spot a
+    table filled with SQLite's auto-assigned rowids. Legacy tables are rebuilt
+    in place; when a tweet id appears more than once the newest row wins.
+    """
+    connection = session.connection()
+    for rowid, tweet_id in connection.execute(_TWEET_FTS_ROWID_BOUNDS).all():
+        if rowid != _tweet_fts_rowid(tweet_id):
+            break
+    else:
+        return
+    rows = connection.execute(
+        text("SELECT tweet_id, account_id, full_text FROM tweet_fts ORDER BY rowid")
+    ).all()
+    connection.execute(text("DELETE FROM tweet_fts"))
+    latest = {row[0]: tuple(row) for row in rows}
+    bulk_sync_tweet_fts(session, list(latest.values()))
 
 
 def sync_tweet_fts(
@@ -62,19 +150,70 @@ def sync_tweet_fts(
     account_id: str,
     full_text: str,
 ) -> None:
-    delete_stmt = text("DELETE FROM tweet_fts WHERE tweet_id = :tweet_id").bindparams(
-        tweet_id=tweet_id
-    )
-    insert_stmt = text(
-        "INSERT INTO tweet_fts(tweet_id, account_id, full_text) "
-        "VALUES(:tweet_id, :account_id, :full_text)"
-    ).bindparams(
-        tweet_id=tweet_id,
-        account_id=account_id,
-        full_text=full_text,
+    bulk_sync_tweet_fts(session, [(tweet_id, account_id, full_text)])
+
+
+def bulk_sync_tweet_fts(session: Session, rows: Sequence[tuple[str, str, str]]) -> None:
+    """
+    Write FTS rows for many tweets with one INSERT OR REPLACE executemany.
+
+    `rows` holds `(tweet_id, account_id, full_text)` tuples. Any existing row
+    for the same tweet is replaced through its derived rowid.
+    """
+    if not rows:
+        return
+    session.connection().execute(
+        _TWEET_FTS_UPSERT,
+        [
+            {
+                "rowid": _tweet_fts_rowid(tweet_id),
+                "tweet_id": tweet_id,
+                "account_id": account_id,
+                "full_text": full_text,
+            }
+            for tweet_id, account_id, full_text in rows
+        ],
     )
-    session.exec(delete_stmt)
-    session.exec(insert_stmt)
+
+
+def sync_tweet_fts_from_tweets(session: Session, tweet_ids: Iterable[str]) -> None:
+    """
+    Index tweets that are already written to the `tweet` table.
+
+    The text is copied inside SQLite, so callers only pass ids. Pending ORM
+    changes must be flushed first.
+    """
+    params = [
+        {"rowid": _tweet_fts_rowid(tweet_id), "tweet_id": tweet_id}
+        for tweet_id in tweet_ids
+    ]
+    if params:
+        session.connection().execute(_TWEET_FTS_UPSERT_FROM_TWEET, params)
+
+
+def _search_rows(
+    session: Session,
+    *,
+    query: str,
+    author: Optional[str],
+    since: Optional[date],
+    until: Optional[date],
+    limit: int,
+) -> Sequence[Any]:
+    if not query.strip():
+        return []
+    ensure_tweet_fts(session)
+    username = _normalize_author(author) if author else None
+    return session.connection().execute(
+        _SEARCH_STATEMENT,
+        {
+            "query": query,
+            "username": username,
+            "since": _date_to_utc_datetime(since, end=False),
+            "until": _date_to_utc_datetime(until, end=True),
+            "limit": limit,
+        },
+    ).mappings().all()
 
 
 def search_tweets(
@@ -86,48 +225,9 @@ def search_tweets(
     until: Optional[date] = None,
     limit: int = 20,
 ) -> list[SearchResult]:
-    if not query.strip():
-        return []
-    ensure_tweet_fts(session)
-
-    account_id = _resolve_author_account_id(session, author)
-    if author and account_id is None:
-        return []
-
-    since_dt = _date_to_utc_datetime(since, end=False)
-    until_dt = _date_to_utc_datetime(until, end=True)
-
-    statement = text(
-        """
-        SELECT
-          t.tweet_id,
-          a.account_id,
-          a.username,
-          a.account_display_name,
-          t.created_at,
-          t.full_text,
-          t.tweet_kind,
-          bm25(tweet_fts) AS rank
-        FROM tweet_fts
-        JOIN tweet t ON t.tweet_id = tweet_fts.tweet_id
-        JOIN account a ON a.account_id = t.account_id
-        WHERE tweet_fts MATCH :query
-          AND (:account_id IS NULL OR t.account_id = :account_id)
-          AND (:since IS NULL OR t.created_at >= :since)
-          AND (:until IS NULL OR t.created_at <= :until)
-        ORDER BY rank ASC, t.created_at IS NULL, t.created_at DESC
-        LIMIT :limit;
-        """
-    )
-    statement = statement.bindparams(
-        query=query,
-        account_id=account_id,
-        since=since_dt,
-        until=until_dt,
-        limit=limit,
+    rows = _search_rows(
+        session, query=query, author=author, since=since, until=until, limit=limit
     )
-    rows = session.exec(statement).mappings().all()
-
     results: list[SearchResult] = []
     for row in rows:
         created_at = coerce_datetime(row["created_at"])
@@ -148,6 +248,39 @@ def search_tweets(
     return results
 
 
+def search_tweets_payload(
+    session: Session,
+    *,
+    query: str,
+    author: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """
+    Same as `search_results_payload(search_tweets(...))`, but rows are
+    projected straight into JSON-ready dicts without building result objects.
+    """
+    rows = _search_rows(
+        session, query=query, author=author, since=since, until=until, limit=limit
+    )
+    results = [
+        {
+            "tweet_id": row["tweet_id"],
+            "created_at": format_timestamp(coerce_datetime(row["created_at"])),
+            "full_text": row["full_text"],
+            "tweet_kind": row["tweet_kind"],
+            "owner": {
+                "account_id": row["account_id"],
+                "username": row["username"],
+                "account_display_name": row["account_display_name"],
+            },
+        }
+        for row in rows
+    ]
+    return {"count": len(results), "results": results}
+
+
 def search_tweets_in_db(
     db_url: Optional[str],
     *,
@@ -157,11 +290,7 @@ def search_tweets_in_db(
     until: Optional[date] = None,
     limit: int = 20,
 ) -> list[SearchResult]:
-    if not db_url:
-        db_url = get_default_db_url()
-    engine = get_engine(db_url)
-    init_db(engine)
-    with get_session(engine) as session:
+    with _open_search_session(db_url) as session:
         return search_tweets(
             session,
             query=query,
@@ -172,6 +301,35 @@ def search_tweets_in_db(
         )
 
 
+def search_tweets_payload_in_db(
+    db_url: Optional[str],
+    *,
+    query: str,
+    author: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """Database-level wrapper around `search_tweets_payload` for `search --json`."""
+    with _open_search_session(db_url) as session:
+        return search_tweets_payload(
+            session,
+            query=query,
+            author=author,
+            since=since,
+            until=until,
+            limit=limit,
+        )
+
+
+def _open_search_session(db_url: Optional[str]) -> Session:
+    if not db_url:
+        db_url = get_default_db_url()
+    engine = get_engine(db_url)
+    init_db(engine)
+    return get_session(engine)
+
+
 def search_results_payload(results: list[SearchResult]) -> dict[str, Any]:
     return {"count": len(results), "results": [result.to_dict() for result in results]}
 
@@ -183,17 +341,6 @@ def _normalize_author(author: str) -> str:
     return author
 
 
-def _resolve_author_account_id(session: Session, author: Optional[str]) -> Optional[str]:
-    if not author:
-        return None
-    normalized = _normalize_author(author)
-    statement = select(Account).where(Account.username == normalized).limit(1)
-    account = session.exec(statement).first()
-    if account is None:
-        return None
-    return account.account_id
-
-
 def _date_to_utc_datetime(value: Optional[date], *, end: bool) -> Optional[datetime]:
     if value is None:
         return None
@@ -1,56 +1,110 @@
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 import requests
-from .media import create_media_payload
-from .auth import create_oauth1_auth
 from . import config as config_module
+from . import json_compat
+from .http import get_session
 from .utils import extract_tweet_id
 
+if TYPE_CHECKING:
+    from requests_oauthlib import OAuth1
+
 logger = logging.getLogger(__name__)
 
+# The app-wide pooled session, so repeated requests (including the retry after
+# a token refresh) reuse an open TLS connection. Auth is passed per request
+# because OAuth1 signatures are request-specific.
+_SESSION = get_session()
+
+# profile -> ((tokens path, mtime_ns, size), access token). The tokens file is
+# only re-read and re-parsed after it changes on disk.
+_TOKEN_CACHE: dict[str, tuple[tuple[str, int, int], str]] = {}
+
+# Longest slice of an unparseable response body written to the log.
+_LOG_BODY_LIMIT = 512
+
+# Fixed messages for statuses whose body carries nothing more useful.
+_STATUS_MESSAGES: dict[int, str] = {
+    429: "Rate limit exceeded. Please wait a few minutes and try again.",
+    503: (
+        "Error (503): Service Unavailable. "
+        "The X API is not responding. This may indicate that your API plan "
+        "does not support this endpoint or that the API is experiencing an outage. "
+        "Check your plan at https://developer.x.com/en/portal/products."
+    ),
+}
+
+_OAUTH2_APP_KEYS = ("X_OAUTH2_CLIENT_ID", "X_OAUTH2_REDIRECT_URI")
+_OAUTH1_KEYS = ("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET")
+
 def _get_env_or_config(key: str) -> str | None:
     return os.getenv(key) or config_module.get_credential(key)
 
-def _has_oauth2_app_config() -> bool:
-    # OAuth2 app keys are shared (not per-profile), but we still use
-    # get_credential so profile selection logic remains consistent.
-    return bool(_get_env_or_config("X_OAUTH2_CLIENT_ID") and _get_env_or_config("X_OAUTH2_REDIRECT_URI"))
-
-def _has_oauth1_credentials() -> bool:
-    return all(
-        _get_env_or_config(key)
-        for key in (
-            "X_API_KEY",
-            "X_API_SECRET",
-            "X_ACCESS_TOKEN",
-            "X_ACCESS_TOKEN_SECRET",
-        )
-    )
+def _get_many(keys: tuple[str, ...]) -> dict[str, str | None]:
+    # Like `_get_env_or_config` per key, but the config file is read at most
+    # once for all keys the environment does not provide.
+    values: dict[str, str | None] = {key: os.getenv(key) for key in keys}
+    missing = [key for key, value in values.items() if not value]
+    if missing:
+        values.update(config_module.get_credentials(missing))
+    return values
+
+def _oauth2_only_configured() -> bool:
+    # OAuth2 app keys are shared (not per-profile), but we still use the
+    # credential lookup so profile selection logic remains consistent. Both
+    # checks share one config read, skipped entirely when the environment
+    # provides every key.
+    values = _get_many(_OAUTH2_APP_KEYS + _OAUTH1_KEYS)
+    if not all(values[key] for key in _OAUTH2_APP_KEYS):
+        return False
+    return not all(values[key] for key in _OAUTH1_KEYS)
 
 def _selected_profile_name() -> str | None:
     profile_override = getattr(config_module, "_PROFILE_OVERRIDE", None)
     return profile_override or config_module.get_active_profile()
 
+def _response_json(response: requests.Response) -> Any:
+    # Decode the raw body directly (orjson when installed); malformed bodies
+    # raise ValueError just like `response.json()`.
+    return json_compat.loads(response.content)
+
+def _body_excerpt(body: bytes) -> str:
+    # Bounded, never-failing text form of a response body for log lines.
+    return body[:_LOG_BODY_LIMIT].decode("utf-8", errors="replace")
+
+def create_oauth1_auth() -> "OAuth1":
+    # Imported on first use so text-only OAuth2 posts never load
+    # requests_oauthlib through this module.
+    from .auth import create_oauth1_auth as _create_oauth1_auth
+
+    return _create_oauth1_auth()
+
+def create_media_payload(path: str | None) -> dict[str, dict[str, list[str]]]:
+    from .media import create_media_payload as _create_media_payload
+
+    return _create_media_payload(path=path)
+
 def create_text_payload(text: str) -> dict[str, str]:
     return {"text": text}
 
 def create_tweet_payload(text: str, media_path: str | None = None, reply_to: str | None = None) -> dict:
-    payload = {}
+    payload: dict = {}
     
     # Add text if provided and not empty
     if text and text.strip():
-        payload.update(create_text_payload(text=text))
+        payload["text"] = text
     
     # Add media if provided
     if media_path:
-        media_payload = create_media_payload(path=media_path)
-        payload.update(media_payload)
+        payload.update(create_media_payload(path=media_path))
     
     # Add reply parameters if provided
     if reply_to:
-        tweet_id = extract_tweet_id(reply_to)
         payload["reply"] = {
-            "in_reply_to_tweet_id": tweet_id
+            "in_reply_to_tweet_id": extract_tweet_id(reply_to)
         }
     
     return payload
@@ -62,19 +116,31 @@ def construct_tweet_link(tweet_id: str) -> str:
         return f"https://x.com/status/{tweet_id}"
     return f"https://x.com/{username}/status/{tweet_id}"
 
-def _load_oauth2_access_token() -> str | None:
+def _load_oauth2_access_token(profile_name: str | None = None) -> str | None:
     """
-    Load an OAuth2 access token for the currently selected profile.
+    Load an OAuth2 access token for `profile_name`, defaulting to the
+    currently selected profile.
 
     Profile selection respects `birdapp --profile ...` because `get_credential`
     consults the profile override.
     """
-    profile_name = _selected_profile_name()
+    if profile_name is None:
+        profile_name = _selected_profile_name()
     if not profile_name:
         return None
 
     from . import session as session_module
 
+    tokens_path = session_module.get_tokens_path()
+    try:
+        stat = os.stat(tokens_path)
+        file_key = (tokens_path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    cached = _TOKEN_CACHE.get(profile_name)
+    if file_key is not None and cached is not None and cached[0] == file_key:
+        return cached[1]
+
     loaded = session_module.load_any_oauth2_token(profile_name)
     if not loaded:
         return None
@@ -82,7 +148,10 @@ def _load_oauth2_access_token() -> str | None:
     access_token = token.get("access_token")
     if not isinstance(access_token, str) or not access_token.strip():
         return None
-    return access_token.strip()
+    access_token = access_token.strip()
+    if file_key is not None:
+        _TOKEN_CACHE[profile_name] = (file_key, access_token)
+    return access_token
 
 
 def handle_tweet_response(response: requests.Response) -> tuple[bool, str]:
@@ -93,40 +162,40 @@ def handle_tweet_response(response: requests.Response) -> tuple[bool, str]:
     - message: A user-friendly message describing the result
     """
     if response.ok:
-        tweet_id = response.json().get("data", {}).get("id", "")
+        tweet_id = _response_json(response).get("data", {}).get("id", "")
         tweet_link = construct_tweet_link(tweet_id=tweet_id)
         logger.info("Successfully posted tweet: %s", tweet_link)
         return True, f"Tweet posted successfully! View it at: {tweet_link}"
 
+    status_code = response.status_code
+    body = response.content
     try:
-        error_details = response.json()
+        error_details = json_compat.loads(body)
+    except ValueError:
+        error_details = None
+        error_msg = f"Error ({status_code}): {response.reason}"
+        logger.error("Failed to parse error response: %s", _body_excerpt(body))
+
+    if error_details is not None:
+        detail = None
+        if isinstance(error_details, dict):
+            detail = error_details.get("detail") or error_details.get("title")
         if 'errors' in error_details:
             error_messages = [error['message'] for error in error_details['errors']]
             error_msg = '; '.join(error_messages)
             logger.error("Twitter API errors: %s", error_messages)
         else:
-            status_code = response.status_code
-            if status_code == 429:
-                error_msg = "Rate limit exceeded. Please wait a few minutes and try again."
+            error_msg = _STATUS_MESSAGES.get(status_code)
+            if error_msg is None:
+                detail_or_reason = detail or response.reason
+                error_msg = f"Error ({status_code}): {detail_or_reason}"
+                logger.error("API error %d: %s", status_code, detail_or_reason)
             elif status_code == 503:
-                error_msg = (
-                    "Error (503): Service Unavailable. "
-                    "The X API is not responding. This may indicate that your API plan "
-                    "does not support this endpoint or that the API is experiencing an outage. "
-                    "Check your plan at https://developer.x.com/en/portal/products."
-                )
                 logger.error("API returned 503 Service Unavailable")
-            else:
-                detail = error_details.get('detail') or error_details.get('title') or response.reason
-                error_msg = f"Error ({status_code}): {detail}"
-                logger.error("API error %d: %s", status_code, detail)
-
-        status_code = response.status_code
-        if status_code == 403:
-            detail_text = ""
-            if isinstance(error_details, dict):
-                detail_text = str(error_details.get("detail") or error_details.get("title") or "")
-            if "scope" in detail_text.lower() or "permission" in detail_text.lower():
+
+        if status_code == 403 and detail:
+            lowered = str(detail).lower()
+            if any(keyword in lowered for keyword in ("scope", "permission")):
                 from .oauth2 import DEFAULT_OAUTH2_SCOPES
 
                 error_msg = (
@@ -135,13 +204,51 @@ def handle_tweet_response(response: requests.Response) -> tuple[bool, str]:
                     "Re-run `birdapp auth config --oauth2` (set `X_OAUTH2_SCOPES` to "
                     f"`{DEFAULT_OAUTH2_SCOPES}`), then re-run `birdapp auth login`."
                 )
-    except ValueError:
-        error_msg = f"Error ({response.status_code}): {response.reason}"
-        logger.error("Failed to parse error response: %s", response.text)
-    
+
     logger.error("Failed to post tweet: %s", error_msg)
     return False, f"Failed to post tweet: {error_msg}"
 
+def _refresh_oauth2_access_token(profile_name: str, rejected: str) -> str | None:
+    """
+    Refresh `profile_name`'s OAuth2 token after the API rejected `rejected`.
+
+    Runs under the profile's refresh lock. If another process refreshed the
+    token while we waited, its stored access token is reused instead of
+    spending the (single-use) refresh token a second time.
+    """
+    from . import oauth2 as oauth2_module
+    from . import session as session_module
+
+    with session_module.token_refresh_lock(profile_name):
+        loaded = session_module.load_any_oauth2_token(profile_name)
+        if not loaded:
+            return None
+        user_id, token = loaded
+        stored_access = token.get("access_token")
+        if isinstance(stored_access, str) and stored_access.strip() and stored_access.strip() != rejected:
+            return stored_access.strip()
+
+        refresh_token = token.get("refresh_token")
+        client_id = _get_env_or_config("X_OAUTH2_CLIENT_ID")
+        client_secret = _get_env_or_config("X_OAUTH2_CLIENT_SECRET")
+        if not (isinstance(refresh_token, str) and refresh_token.strip() and isinstance(client_id, str) and client_id.strip()):
+            return None
+        refreshed = oauth2_module.refresh_access_token(
+            refresh_token=refresh_token.strip(),
+            client_id=client_id.strip(),
+            client_secret=client_secret.strip() if isinstance(client_secret, str) and client_secret.strip() else None,
+        )
+        merged = dict(token)
+        merged.update(refreshed)
+        if "refresh_token" not in merged:
+            merged["refresh_token"] = refresh_token
+        session_module.save_token(user_id=user_id, token=merged, profile=profile_name)
+
+    new_access = merged.get("access_token")
+    if isinstance(new_access, str) and new_access.strip():
+        return new_access.strip()
+    return None
+
 def submit_tweet(text: str, media_path: str | None = None, reply_to: str | None = None) -> requests.Response:
     """
     Post a tweet with optional media and reply.
@@ -153,50 +260,34 @@ def submit_tweet(text: str, media_path: str | None = None, reply_to: str | None
     tweet_payload = create_tweet_payload(text=text, media_path=media_path, reply_to=reply_to)
     logger.info(f"Posting tweet with payload: {tweet_payload}")
 
+    # Encoded once: the 401 retry re-sends the same bytes instead of having
+    # `requests` serialize the payload again.
+    body = json_compat.dumps(tweet_payload).encode("utf-8")
     headers: dict[str, str] = {"Content-Type": "application/json"}
-    access_token = _load_oauth2_access_token()
+    profile_name = _selected_profile_name()
+    access_token = _load_oauth2_access_token(profile_name)
     if access_token:
         headers["Authorization"] = f"Bearer {access_token}"
-        response = requests.request(
+        response = _SESSION.request(
             method="POST",
             url="https://api.x.com/2/tweets",
-            json=tweet_payload,
+            data=body,
             headers=headers,
         )
 
         if response.status_code == 401:
-            from . import oauth2 as oauth2_module
-            from . import session as session_module
-
-            profile_name = _selected_profile_name()
             if profile_name:
-                loaded = session_module.load_any_oauth2_token(profile_name)
-                if loaded:
-                    user_id, token = loaded
-                    refresh_token = token.get("refresh_token")
-                    client_id = _get_env_or_config("X_OAUTH2_CLIENT_ID")
-                    client_secret = _get_env_or_config("X_OAUTH2_CLIENT_SECRET")
-                    if isinstance(refresh_token, str) and refresh_token.strip() and isinstance(client_id, str) and client_id.strip():
-                        refreshed = oauth2_module.refresh_access_token(
-                            refresh_token=refresh_token.strip(),
-                            client_id=client_id.strip(),
-                            client_secret=client_secret.strip() if isinstance(client_secret, str) and client_secret.strip() else None,
-                        )
-                        merged = dict(token)
-                        merged.update(refreshed)
-                        if "refresh_token" not in merged and isinstance(refresh_token, str):
-                            merged["refresh_token"] = refresh_token
-                        session_module.save_token(user_id=user_id, token=merged, profile=profile_name)
-
-                        new_access = merged.get("access_token")
-                        if isinstance(new_access, str) and new_access.strip():
-                            headers["Authorization"] = f"Bearer {new_access.strip()}"
-                            return requests.request(
-                                method="POST",
-                                url="https://api.x.com/2/tweets",
-                                json=tweet_payload,
-                                headers=headers,
-                            )
+                # The rejected token must not be served from the cache again.
+                _TOKEN_CACHE.pop(profile_name, None)
+                new_access = _refresh_oauth2_access_token(profile_name, rejected=access_token)
+                if new_access:
+                    headers["Authorization"] = f"Bearer {new_access}"
+                    return _SESSION.request(
+                        method="POST",
+                        url="https://api.x.com/2/tweets",
+                        data=body,
+                        headers=headers,
+                    )
 
             profile_hint = f"--profile {profile_name} " if profile_name else ""
             raise RuntimeError(
@@ -209,8 +300,7 @@ def submit_tweet(text: str, media_path: str | None = None, reply_to: str | None
     # No OAuth2 access token is available for this profile. If OAuth2 is
     # configured, prefer guiding the user through OAuth2 login instead of
     # falling back to OAuth1 and prompting for OAuth1 credentials.
-    if _has_oauth2_app_config() and not _has_oauth1_credentials():
-        profile_name = _selected_profile_name()
+    if _oauth2_only_configured():
         profile_hint = f"--profile {profile_name} " if profile_name else ""
         raise RuntimeError(
             "No OAuth2 login token is stored for this profile. "
@@ -218,10 +308,10 @@ def submit_tweet(text: str, media_path: str | None = None, reply_to: str | None
         )
 
     auth = create_oauth1_auth()
-    return requests.request(
+    return _SESSION.request(
         method="POST",
         url="https://api.x.com/2/tweets",
-        json=tweet_payload,
+        data=body,
         auth=auth,
         headers=headers,
     )
@@ -238,6 +328,84 @@ def post_tweet(text: str, media_path: str | None = None, reply_to: str | None =
         logger.error("Error posting tweet: %s", str(e))
         return False, f"Error posting tweet: {str(e)}"
 
+_TWEETS_LOOKUP_MAX_IDS = 100
+_RATE_LIMIT_RETRIES = 3
+# Longest rate-limit reset worth waiting out; a later (or bogus) reset is
+# reported to the user instead of silently blocking the command.
+_RATE_LIMIT_MAX_WAIT_SECONDS = 60.0
+
+# Fixed query fields for tweet lookups; `requests` accepts a sequence of pairs.
+_TWEETS_LOOKUP_PARAMS: tuple[tuple[str, str], ...] = (
+    ("tweet.fields", "created_at,author_id,public_metrics,context_annotations,lang,possibly_sensitive"),
+    ("expansions", "author_id"),
+    ("user.fields", "name,username,verified,public_metrics"),
+)
+
+def _lookup_tweets(tweet_ids: list[str], auth: "OAuth1") -> requests.Response:
+    return _SESSION.get(
+        url="https://api.x.com/2/tweets",
+        params=(("ids", ",".join(tweet_ids)),) + _TWEETS_LOOKUP_PARAMS,
+        auth=auth
+    )
+
+def _tweets_lookup_result(response: requests.Response) -> tuple[bool, str | dict]:
+    if response.ok:
+        data = _response_json(response)
+        logger.info("Successfully retrieved tweets")
+        return True, data
+    try:
+        error_details = _response_json(response)
+        if 'errors' in error_details:
+            error_messages = [error['detail'] for error in error_details['errors']]
+            error_msg = '; '.join(error_messages)
+        else:
+            error_msg = f"Error ({response.status_code}): {response.reason}"
+        logger.error("Failed to retrieve tweets: %s", error_msg)
+        return False, error_msg
+    except ValueError:
+        error_msg = f"Error ({response.status_code}): {response.reason}"
+        logger.error("Failed to parse error response: %s", _body_excerpt(response.content))
+        return False, error_msg
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return max(1.0, float(retry_after))
+        except ValueError:
+            pass
+    reset = response.headers.get("x-rate-limit-reset")
+    if reset is not None:
+        try:
+            return max(1.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return 1.0
+
+def _merge_tweet_lookups(results: list[dict]) -> dict:
+    # Concatenate `data`/`errors` in chunk order; expanded objects shared by
+    # several chunks (e.g. the same author) are kept once.
+    merged: dict[str, Any] = {}
+    includes: dict[str, list[dict]] = {}
+    seen_includes: dict[str, set] = {}
+    for result in results:
+        for key in ("data", "errors"):
+            if key in result:
+                merged.setdefault(key, []).extend(result[key])
+        for key, items in result.get("includes", {}).items():
+            bucket = includes.setdefault(key, [])
+            seen = seen_includes.setdefault(key, set())
+            for item in items:
+                item_id = item.get("id")
+                if item_id is not None:
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                bucket.append(item)
+    if includes:
+        merged["includes"] = includes
+    return merged
+
 def get_tweets_by_ids(tweet_ids: list[str]) -> tuple[bool, str | dict]:
     """
     Retrieve tweets by their IDs using the X API.
@@ -246,43 +414,64 @@ def get_tweets_by_ids(tweet_ids: list[str]) -> tuple[bool, str | dict]:
     if not tweet_ids:
         return False, "No tweet IDs provided"
     
-    if len(tweet_ids) > 100:
-        return False, "Too many tweet IDs provided (maximum 100)"
+    if len(tweet_ids) > _TWEETS_LOOKUP_MAX_IDS:
+        return False, f"Too many tweet IDs provided (maximum {_TWEETS_LOOKUP_MAX_IDS})"
     
     try:
         auth = create_oauth1_auth()
-        ids_param = ",".join(tweet_ids)
-        
-        response = requests.get(
-            url="https://api.x.com/2/tweets",
-            params={
-                "ids": ids_param,
-                "tweet.fields": "created_at,author_id,public_metrics,context_annotations,lang,possibly_sensitive",
-                "expansions": "author_id",
-                "user.fields": "name,username,verified,public_metrics"
-            },
-            auth=auth
-        )
-        
-        if response.ok:
-            data = response.json()
-            logger.info("Successfully retrieved tweets")
-            return True, data
+        return _tweets_lookup_result(_lookup_tweets(tweet_ids, auth))
+    except Exception as e:
+        logger.error("Error retrieving tweets: %s", str(e))
+        return False, f"Error retrieving tweets: {str(e)}"
+
+def get_tweets_by_ids_many(tweet_ids: list[str], max_workers: int = 8) -> tuple[bool, str | dict]:
+    """
+    Retrieve any number of tweets, 100 IDs per request, with up to
+    `max_workers` requests in flight on the shared session.
+    Rate-limited (429) chunks wait out the advertised reset and are retried,
+    unless the reset is more than a minute away.
+    Returns (success, result) like `get_tweets_by_ids`, with the chunk
+    responses merged in input order.
+    """
+    if not tweet_ids:
+        return False, "No tweet IDs provided"
+
+    chunks = [
+        tweet_ids[start:start + _TWEETS_LOOKUP_MAX_IDS]
+        for start in range(0, len(tweet_ids), _TWEETS_LOOKUP_MAX_IDS)
+    ]
+    try:
+        auth = create_oauth1_auth()
+
+        def fetch(chunk: list[str]) -> tuple[bool, str | dict]:
+            response = _lookup_tweets(chunk, auth)
+            for _ in range(_RATE_LIMIT_RETRIES):
+                if response.status_code != 429:
+                    break
+                delay = _retry_after_seconds(response)
+                if delay > _RATE_LIMIT_MAX_WAIT_SECONDS:
+                    logger.error("Rate limited retrieving tweets; reset is %.0fs away", delay)
+                    return False, (
+                        f"Rate limit exceeded; the X API allows new requests in {delay:.0f}s. "
+                        "Please try again later."
+                    )
+                logger.warning("Rate limited retrieving tweets; retrying in %.0fs", delay)
+                time.sleep(delay)
+                response = _lookup_tweets(chunk, auth)
+            return _tweets_lookup_result(response)
+
+        if len(chunks) == 1:
+            results = [fetch(chunks[0])]
         else:
-            try:
-                error_details = response.json()
-                if 'errors' in error_details:
-                    error_messages = [error['detail'] for error in error_details['errors']]
-                    error_msg = '; '.join(error_messages)
-                else:
-                    error_msg = f"Error ({response.status_code}): {response.reason}"
-                logger.error("Failed to retrieve tweets: %s", error_msg)
-                return False, error_msg
-            except ValueError:
-                error_msg = f"Error ({response.status_code}): {response.reason}"
-                logger.error("Failed to parse error response: %s", response.text)
-                return False, error_msg
-                
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+                results = list(executor.map(fetch, chunks))
     except Exception as e:
         logger.error("Error retrieving tweets: %s", str(e))
         return False, f"Error retrieving tweets: {str(e)}"
+
+    payloads: list[dict] = []
+    for success, result in results:
+        if not success or isinstance(result, str):
+            return False, result
+        payloads.append(result)
+    return True, _merge_tweet_lookups(payloads)
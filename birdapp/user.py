@@ -1,7 +1,7 @@
 import requests
 from typing import List, Optional, Union, Tuple, Dict, Any
-from .auth import create_oauth1_auth
 from .config import load_config
+from .http import get_session
 
 def get_user_by_id(user_id: str, user_fields: Optional[List[str]] = None, expansions: Optional[List[str]] = None, tweet_fields: Optional[List[str]] = None) -> Tuple[bool, Union[Dict[str, Any], str]]:
     """
@@ -20,6 +20,8 @@ def get_user_by_id(user_id: str, user_fields: Optional[List[str]] = None, expans
     if not creds:
         return False, "No credentials configured. Run 'x config' first."
     
+    from .auth import create_oauth1_auth
+
     auth = create_oauth1_auth()
     
     url = f"https://api.x.com/2/users/{user_id}"
@@ -33,7 +35,7 @@ def get_user_by_id(user_id: str, user_fields: Optional[List[str]] = None, expans
         params['tweet.fields'] = ','.join(tweet_fields)
     
     try:
-        response = requests.get(url, auth=auth, params=params)
+        response = get_session().get(url, auth=auth, params=params)
         response.raise_for_status()
         return True, response.json()
     except requests.exceptions.HTTPError as e:
@@ -63,6 +65,8 @@ def get_users_by_ids(user_ids: List[str], user_fields: Optional[List[str]] = Non
     if not creds:
         return False, "No credentials configured. Run 'x config' first."
     
+    from .auth import create_oauth1_auth
+
     auth = create_oauth1_auth()
     
     url = "https://api.x.com/2/users"
@@ -78,7 +82,7 @@ def get_users_by_ids(user_ids: List[str], user_fields: Optional[List[str]] = Non
         params['tweet.fields'] = ','.join(tweet_fields)
     
     try:
-        response = requests.get(url, auth=auth, params=params)
+        response = get_session().get(url, auth=auth, params=params)
         response.raise_for_status()
         return True, response.json()
     except requests.exceptions.HTTPError as e:
@@ -106,6 +110,8 @@ def get_user_by_username(username: str, user_fields: Optional[List[str]] = None,
     if not creds:
         return False, "No credentials configured. Run 'x config' first."
     
+    from .auth import create_oauth1_auth
+
     auth = create_oauth1_auth()
     
     url = f"https://api.x.com/2/users/by/username/{username}"
@@ -119,7 +125,7 @@ def get_user_by_username(username: str, user_fields: Optional[List[str]] = None,
         params['tweet.fields'] = ','.join(tweet_fields)
     
     try:
-        response = requests.get(url, auth=auth, params=params)
+        response = get_session().get(url, auth=auth, params=params)
         response.raise_for_status()
         return True, response.json()
     except requests.exceptions.HTTPError as e:
@@ -152,6 +158,8 @@ def get_users_by_usernames(usernames: List[str], user_fields: Optional[List[str]
     if not creds:
         return False, "No credentials configured. Run 'x config' first."
     
+    from .auth import create_oauth1_auth
+
     auth = create_oauth1_auth()
     
     url = "https://api.x.com/2/users/by"
@@ -167,7 +175,7 @@ def get_users_by_usernames(usernames: List[str], user_fields: Optional[List[str]
         params['tweet.fields'] = ','.join(tweet_fields)
     
     try:
-        response = requests.get(url, auth=auth, params=params)
+        response = get_session().get(url, auth=auth, params=params)
         response.raise_for_status()
         return True, response.json()
     except requests.exceptions.HTTPError as e:
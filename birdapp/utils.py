@@ -22,6 +22,9 @@ def cleanup_temp_dir() -> None:
 # Register cleanup function
 atexit.register(cleanup_temp_dir)
 
+# Matches both x.com and twitter.com URLs
+_TWEET_URL_RE = re.compile(r'(?:https?://)?(?:www\.)?(?:twitter\.com|x\.com)/[^/]+/status/(\d+)')
+
 def extract_tweet_id(tweet_ref: str) -> str:
     """
     Extract tweet ID from either a tweet ID or URL.
@@ -42,9 +45,7 @@ def extract_tweet_id(tweet_ref: str) -> str:
         return tweet_ref
     
     # Try to extract ID from URL
-    # Matches both x.com and twitter.com URLs
-    url_pattern = r'(?:https?://)?(?:www\.)?(?:twitter\.com|x\.com)/[^/]+/status/(\d+)'
-    match = re.search(url_pattern, tweet_ref)
+    match = _TWEET_URL_RE.search(tweet_ref)
     
     if match:
         return match.group(1)
@@ -0,0 +1,20 @@
+import os
+import re
+
+# One `KEY=value` assignment per line; surrounding quotes and a CRLF line
+# ending's `\r` are dropped. Comment lines never match because the key must
+# start the line as an identifier.
+_DOTENV_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*["']?(.*?)["']?[ \t\r]*$""",
+    re.MULTILINE,
+)
+
+
+def load_dotenv(path: str) -> None:
+    """Populate os.environ from a .env file without overriding existing values."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r") as f:
+        text = f.read()
+    for match in _DOTENV_RE.finditer(text):
+        os.environ.setdefault(match.group(1), match.group(2))
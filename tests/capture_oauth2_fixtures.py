@@ -3,24 +3,9 @@ import os
 import sys
 from typing import Optional
 
-ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
+from _dotenv import load_dotenv
 
-def _load_dotenv(path: str) -> None:
-    if not os.path.exists(path):
-        return
-    with open(path, "r") as f:
-        for line in f:
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            if "=" not in stripped:
-                continue
-            key, value = stripped.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key:
-                os.environ.setdefault(key, value)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 def main() -> None:
@@ -43,7 +28,7 @@ def main() -> None:
     parser.add_argument("--timeout", type=int, default=180, help="Callback timeout in seconds")
     args = parser.parse_args()
 
-    _load_dotenv(os.path.join(ROOT_DIR, ".env"))
+    load_dotenv(os.path.join(ROOT_DIR, ".env"))
 
     client_id = os.getenv("X_OAUTH2_CLIENT_ID")
     redirect_uri = os.getenv("X_OAUTH2_REDIRECT_URI")
@@ -68,8 +53,8 @@ def main() -> None:
     print(f"Waiting for callback on {redirect_uri} ...")
 
     params = wait_for_oauth_callback(redirect_uri=redirect_uri, timeout_seconds=args.timeout)
-    returned_state = params.get("state", [None])[0]
-    code = params.get("code", [None])[0]
+    returned_state = params.get("state")
+    code = params.get("code")
     if not code or returned_state != state:
         raise RuntimeError("Invalid OAuth2 callback (missing code or state mismatch)")
 
@@ -1,64 +1,36 @@
 import argparse
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 
-ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
+from _dotenv import load_dotenv
 
-def _load_dotenv(path: str) -> None:
-    if not os.path.exists(path):
-        return
-    with open(path, "r") as f:
-        for line in f:
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            if "=" not in stripped:
-                continue
-            key, value = stripped.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key:
-                os.environ.setdefault(key, value)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 def _normalize_profile(profile: str) -> str:
     return profile.strip().lstrip("@")
 
 
-def main() -> None:
-    if ROOT_DIR not in sys.path:
-        sys.path.insert(0, ROOT_DIR)
-
-    from birdapp import oauth2
-    from birdapp import session
-    from birdapp.config import get_active_profile, get_credential
+@lru_cache(maxsize=None)
+def _client_credentials(profile: str) -> tuple[str | None, str | None]:
+    """Resolve the OAuth2 client id/secret for `profile` with one config read."""
+    from birdapp.config import get_credentials
 
-    parser = argparse.ArgumentParser(
-        description="Refresh OAuth2 token and capture updated fixtures"
-    )
-    parser.add_argument(
-        "--profile",
-        type=str,
-        default=None,
-        help="Profile name to refresh (default: active profile)",
+    stored = get_credentials(("X_OAUTH2_CLIENT_ID", "X_OAUTH2_CLIENT_SECRET"), profile=profile)
+    return (
+        os.getenv("X_OAUTH2_CLIENT_ID") or stored["X_OAUTH2_CLIENT_ID"],
+        os.getenv("X_OAUTH2_CLIENT_SECRET") or stored["X_OAUTH2_CLIENT_SECRET"],
     )
-    parser.add_argument(
-        "--fixtures-dir",
-        type=str,
-        default=os.path.join(ROOT_DIR, "tests", "fixtures"),
-        help="Directory to write fixtures into",
-    )
-    args = parser.parse_args()
 
-    _load_dotenv(os.path.join(ROOT_DIR, ".env"))
 
-    profile = _normalize_profile(args.profile) if args.profile else (get_active_profile() or "")
-    if not profile:
-        raise RuntimeError(
-            "No profile specified and no active profile set. "
-            "Run `birdapp profile use <username>` or pass --profile."
-        )
+def _refresh_one(profile: str, fixtures_dir: str, save_lock: threading.Lock) -> str:
+    """Refresh one profile's token, fetch /2/users/me, and write its fixtures."""
+    from birdapp import oauth2
+    from birdapp import session
 
     loaded = session.load_any_oauth2_token(profile)
     if not loaded:
@@ -75,32 +47,36 @@ def main() -> None:
             f"`offline.access` (default: {oauth2.DEFAULT_OAUTH2_SCOPES!r}), then re-login."
         )
 
-    client_id = os.getenv("X_OAUTH2_CLIENT_ID") or get_credential(
-        "X_OAUTH2_CLIENT_ID", profile=profile
-    )
-    client_secret = os.getenv("X_OAUTH2_CLIENT_SECRET") or get_credential(
-        "X_OAUTH2_CLIENT_SECRET", profile=profile
-    )
+    client_id, client_secret = _client_credentials(profile)
     if not isinstance(client_id, str) or not client_id.strip():
         raise RuntimeError(
             "Missing X_OAUTH2_CLIENT_ID. Run `birdapp auth config --oauth2` "
             "or set it in your environment."
         )
 
-    refreshed = oauth2.refresh_access_token(
-        refresh_token=refresh_token.strip(),
-        client_id=client_id.strip(),
-        client_secret=client_secret.strip()
-        if isinstance(client_secret, str) and client_secret.strip()
-        else None,
-    )
-
-    merged = dict(token)
-    merged.update(refreshed)
-    if "refresh_token" not in merged:
-        merged["refresh_token"] = refresh_token
-
-    session.save_token(user_id=user_id, token=merged, profile=profile)
+    # Refresh tokens are single-use: if another process refreshed this profile
+    # while we waited for the lock, reuse its result instead of refreshing again.
+    with session.token_refresh_lock(profile):
+        reloaded = session.load_any_oauth2_token(profile)
+        if reloaded and reloaded[1].get("access_token") != token.get("access_token"):
+            user_id, merged = reloaded
+        else:
+            refreshed = oauth2.refresh_access_token(
+                refresh_token=refresh_token.strip(),
+                client_id=client_id.strip(),
+                client_secret=client_secret.strip()
+                if isinstance(client_secret, str) and client_secret.strip()
+                else None,
+            )
+
+            merged = dict(token)
+            merged.update(refreshed)
+            if "refresh_token" not in merged:
+                merged["refresh_token"] = refresh_token
+
+            # tokens.json is shared by every profile; serialize its read-modify-write.
+            with save_lock:
+                session.save_token(user_id=user_id, token=merged, profile=profile)
 
     access_token = merged.get("access_token")
     if not isinstance(access_token, str) or not access_token.strip():
@@ -108,14 +84,74 @@ def main() -> None:
 
     user_payload = oauth2.get_user_me(access_token=access_token.strip())
     oauth2.write_oauth2_fixtures(
-        token=merged, user_payload=user_payload, fixtures_dir=args.fixtures_dir
+        token=merged, user_payload=user_payload, fixtures_dir=fixtures_dir
     )
+    return fixtures_dir
+
+
+def main() -> None:
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    from birdapp.config import get_active_profile, list_profiles
+
+    parser = argparse.ArgumentParser(
+        description="Refresh OAuth2 token and capture updated fixtures"
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profiles",
+        metavar="PROFILE",
+        action="append",
+        default=None,
+        help="Profile name to refresh; repeat for several (default: active profile)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Refresh every configured profile",
+    )
+    parser.add_argument(
+        "--fixtures-dir",
+        type=str,
+        default=os.path.join(ROOT_DIR, "tests", "fixtures"),
+        help="Directory to write fixtures into (one subdirectory per profile when "
+        "refreshing several)",
+    )
+    args = parser.parse_args()
+
+    load_dotenv(os.path.join(ROOT_DIR, ".env"))
+
+    if args.all:
+        profiles = list_profiles()
+    elif args.profiles:
+        profiles = [_normalize_profile(profile) for profile in args.profiles]
+    else:
+        profiles = [get_active_profile() or ""]
+    profiles = list(dict.fromkeys(profile for profile in profiles if profile))
+    if not profiles:
+        raise RuntimeError(
+            "No profile specified and no active profile set. "
+            "Run `birdapp profile use <username>` or pass --profile."
+        )
+
+    if len(profiles) == 1:
+        fixtures_dirs = [args.fixtures_dir]
+    else:
+        fixtures_dirs = [os.path.join(args.fixtures_dir, profile) for profile in profiles]
+
+    # Each refresh is two dependent round trips; profiles run side by side.
+    save_lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=min(32, len(profiles))) as executor:
+        written = list(
+            executor.map(_refresh_one, profiles, fixtures_dirs, repeat(save_lock))
+        )
 
     print("Wrote OAuth2 fixtures:")
-    print(f"  {os.path.join(args.fixtures_dir, 'oauth2_token.json')}")
-    print(f"  {os.path.join(args.fixtures_dir, 'oauth2_user.json')}")
+    for fixtures_dir in written:
+        print(f"  {os.path.join(fixtures_dir, 'oauth2_token.json')}")
+        print(f"  {os.path.join(fixtures_dir, 'oauth2_user.json')}")
 
 
 if __name__ == "__main__":
     main()
-
@@ -1,13 +1,28 @@
+import io
+import json
+import sqlite3
+import tempfile
 import unittest
 from typing import Any, cast
 from copy import deepcopy
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
 
-from sqlalchemy import text
-from sqlmodel import Session, select
+from sqlalchemy import MetaData, UniqueConstraint, inspect, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, col, func, select
 
 from birdapp.storage.db import get_engine, init_db
-from birdapp.storage.importer import build_archive_url, import_archive_data
+from birdapp.storage.importer import (
+    _parse_archive_datetime,
+    build_archive_url,
+    download_archive,
+    import_archive,
+    import_archive_data,
+)
 from birdapp.storage.models import (
+    Account,
     Follower,
     Following,
     Like,
@@ -15,11 +30,38 @@ from birdapp.storage.models import (
     Tweet,
     TweetHashtag,
     TweetMedia,
+    TweetUserMention,
     UploadOptions,
 )
 
 
+def _clone_archive_lists(data: dict[str, Any]) -> dict[str, Any]:
+    """Copy an archive's top-level section lists; the records themselves are shared."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in data.items()}
+
+
 class TestArchiveImporter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Build the schema once; each test gets a private copy of it.
+        cls._schema_engine = get_engine("sqlite:///:memory:")
+        init_db(cls._schema_engine)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._schema_engine.dispose()
+
+    def _new_engine(self) -> Engine:
+        """Return an isolated in-memory database cloned from the shared schema."""
+        engine = get_engine("sqlite:///:memory:")
+        with self._schema_engine.connect() as source, engine.connect() as target:
+            source_db = cast(sqlite3.Connection, source.connection.driver_connection)
+            source_db.backup(cast(sqlite3.Connection, target.connection.driver_connection))
+        return engine
+
+    def _count(self, session: Session, model: type[SQLModel]) -> int:
+        return session.exec(select(func.count()).select_from(model)).one()
+
     def test_build_archive_url(self) -> None:
         url = build_archive_url("ExampleUser")
         self.assertEqual(
@@ -28,6 +70,39 @@ class TestArchiveImporter(unittest.TestCase):
             "archives/ExampleUser/archive.json",
         )
 
+    def test_download_archive_parses_body(self) -> None:
+        payload = {"account": [{"account": {"accountId": "1"}}], "like": []}
+        response = mock.MagicMock()
+        response.content = json.dumps(payload).encode("utf-8")
+
+        with mock.patch(
+            "birdapp.storage.importer.requests.get", return_value=response
+        ) as get:
+            result = download_archive("https://example.com/archive.json")
+
+        get.assert_called_once_with("https://example.com/archive.json", timeout=60)
+        response.raise_for_status.assert_called_once_with()
+        self.assertEqual(result, payload)
+
+    def test_import_archive_spools_download_to_disk(self) -> None:
+        payload = {"account": [{"account": {"accountId": "42", "username": "example"}}]}
+        response = mock.MagicMock()
+        response.__enter__.return_value = response
+        response.raw = io.BytesIO(json.dumps(payload).encode("utf-8"))
+
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch(
+            "birdapp.storage.importer.requests.get", return_value=response
+        ) as get:
+            counts = import_archive(
+                f"sqlite:///{Path(tmpdir) / 'archive.db'}",
+                url="https://example.com/archive.json",
+            )
+
+        get.assert_called_once_with(
+            "https://example.com/archive.json", stream=True, timeout=60
+        )
+        self.assertEqual(counts["account"], 1)
+
     def test_import_archive_data_inserts_and_parses(self) -> None:
         data = {
             "upload-options": {
@@ -190,8 +265,7 @@ class TestArchiveImporter(unittest.TestCase):
             "following": [{"following": {"accountId": "12", "userLink": "https://x.com/12"}}],
         }
 
-        engine = get_engine("sqlite:///:memory:")
-        init_db(engine)
+        engine = self._new_engine()
         with Session(engine) as session:
             counts = import_archive_data(data, session)
 
@@ -383,7 +457,7 @@ class TestArchiveImporter(unittest.TestCase):
             "following": [{"following": {"accountId": "12", "userLink": "https://x.com/12"}}],
         }
 
-        second_data = deepcopy(base_data)
+        second_data = _clone_archive_lists(base_data)
         tweets = cast(list[dict[str, Any]], second_data["tweets"])
         community_tweets = cast(list[dict[str, Any]], second_data["community-tweet"])
         note_tweets = cast(list[dict[str, Any]], second_data["note-tweet"])
@@ -465,17 +539,16 @@ class TestArchiveImporter(unittest.TestCase):
             {"following": {"accountId": "12", "userLink": "https://x.com/14"}}
         )
 
-        engine = get_engine("sqlite:///:memory:")
-        init_db(engine)
+        engine = self._new_engine()
         with Session(engine) as session:
             import_archive_data(base_data, session)
             import_archive_data(second_data, session)
 
-            self.assertEqual(len(session.exec(select(Tweet)).all()), 4)
-            self.assertEqual(len(session.exec(select(TweetHashtag)).all()), 1)
-            self.assertEqual(len(session.exec(select(TweetMedia)).all()), 1)
-            self.assertEqual(len(session.exec(select(NoteTweet)).all()), 2)
-            self.assertEqual(len(session.exec(select(Like)).all()), 2)
+            self.assertEqual(self._count(session, Tweet), 4)
+            self.assertEqual(self._count(session, TweetHashtag), 1)
+            self.assertEqual(self._count(session, TweetMedia), 1)
+            self.assertEqual(self._count(session, NoteTweet), 2)
+            self.assertEqual(self._count(session, Like), 2)
 
     def test_import_archive_data_multi_user_like_dedupe(self) -> None:
         def make_archive(owner_id: str, username: str, tweet_id: str) -> dict[str, Any]:
@@ -532,8 +605,7 @@ class TestArchiveImporter(unittest.TestCase):
                 "following": [],
             }
 
-        engine = get_engine("sqlite:///:memory:")
-        init_db(engine)
+        engine = self._new_engine()
         with Session(engine) as session:
             import_archive_data(make_archive("42", "alpha", "111"), session)
             import_archive_data(make_archive("99", "beta", "222"), session)
@@ -602,8 +674,7 @@ class TestArchiveImporter(unittest.TestCase):
                 "following": [],
             }
 
-        engine = get_engine("sqlite:///:memory:")
-        init_db(engine)
+        engine = self._new_engine()
         with Session(engine) as session:
             import_archive_data(make_archive("42", "alice", "111"), session)
 
@@ -619,6 +690,9 @@ class TestArchiveImporter(unittest.TestCase):
             with self.assertRaises(ValueError):
                 import_archive_data(make_archive("99", "bob", "111"), session)
 
+            # The rejected import is rolled back as a whole.
+            self.assertIsNone(session.get(Account, "99"))
+
             tweet = session.get(Tweet, "111")
             self.assertIsNotNone(tweet)
             tweet = cast(Tweet, tweet)
@@ -727,8 +801,7 @@ class TestArchiveImporter(unittest.TestCase):
             "following": [],
         }
 
-        engine = get_engine("sqlite:///:memory:")
-        init_db(engine)
+        engine = self._new_engine()
         with Session(engine) as session:
             import_archive_data(data, session)
 
@@ -793,8 +866,7 @@ class TestArchiveImporter(unittest.TestCase):
                 "following": [],
             }
 
-        engine = get_engine("sqlite:///:memory:")
-        init_db(engine)
+        engine = self._new_engine()
         with Session(engine) as session:
             import_archive_data(make_archive("hello"), session)
             import_archive_data(make_archive("hello updated"), session)
@@ -813,3 +885,422 @@ class TestArchiveImporter(unittest.TestCase):
         self.assertIsNotNone(tweet)
         tweet = cast(Tweet, tweet)
         self.assertEqual(tweet.full_text, "hello updated")
+
+    def test_import_archive_data_reimport_dedupes_entities_without_indices(self) -> None:
+        data = {
+            "account": [
+                {
+                    "account": {
+                        "createdVia": "oauth:123",
+                        "username": "example",
+                        "accountId": "42",
+                        "createdAt": "2023-01-01T00:00:00.000Z",
+                        "accountDisplayName": "Example",
+                    }
+                }
+            ],
+            "tweets": [
+                {
+                    "tweet": {
+                        "created_at": "2023-05-01T00:00:00.000Z",
+                        "entities": {
+                            "hashtags": [{"text": "Tag"}],
+                            "symbols": [],
+                            "user_mentions": [{"name": "Anon", "screen_name": "anon"}],
+                            "urls": [],
+                        },
+                        "id_str": "111",
+                        "id": "111",
+                        "full_text": "hello #Tag",
+                        "lang": "en",
+                        "source": "web",
+                    }
+                }
+            ],
+        }
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            first = import_archive_data(data, session)
+            second = import_archive_data(data, session)
+
+            hashtags = session.exec(select(TweetHashtag)).all()
+            mentions = session.exec(select(TweetUserMention)).all()
+
+        self.assertEqual(first["tweet_hashtag"], 1)
+        self.assertEqual(first["tweet_user_mention"], 1)
+        self.assertEqual(second["tweet_hashtag"], 0)
+        self.assertEqual(second["tweet_user_mention"], 0)
+        self.assertEqual(len(hashtags), 1)
+        self.assertIsNone(hashtags[0].start_index)
+        self.assertEqual(len(mentions), 1)
+        self.assertIsNone(mentions[0].user_id)
+
+    def test_import_archive_data_fresh_import_dedupes_repeated_keys(self) -> None:
+        tweet = {
+            "created_at": "2023-05-01T00:00:00.000Z",
+            "entities": {
+                "hashtags": [{"text": "Tag"}, {"text": "Tag"}],
+                "symbols": [],
+                "user_mentions": [],
+                "urls": [],
+            },
+            "id_str": "111",
+            "id": "111",
+            "full_text": "hello #Tag #Tag",
+            "lang": "en",
+            "source": "web",
+        }
+        data = {
+            "account": [
+                {
+                    "account": {
+                        "createdVia": "oauth:123",
+                        "username": "example",
+                        "accountId": "42",
+                        "createdAt": "2023-01-01T00:00:00.000Z",
+                        "accountDisplayName": "Example",
+                    }
+                }
+            ],
+            "tweets": [{"tweet": tweet}, {"tweet": dict(tweet, full_text="hello again")}],
+            "like": [{"like": {"tweetId": "900"}}, {"like": {"tweetId": "900"}}],
+            "follower": [
+                {"follower": {"accountId": "11", "userLink": "old"}},
+                {"follower": {"accountId": "11", "userLink": "new"}},
+            ],
+        }
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            counts = import_archive_data(data, session, fresh_import=True)
+
+            tweets = session.exec(select(Tweet)).all()
+            hashtags = session.exec(select(TweetHashtag)).all()
+            likes = session.exec(select(Like)).all()
+            followers = session.exec(select(Follower)).all()
+
+        self.assertEqual(counts["tweet"], 1)
+        self.assertEqual(counts["tweet_hashtag"], 1)
+        self.assertEqual(counts["like"], 1)
+        self.assertEqual(counts["follower"], 1)
+        self.assertEqual([t.full_text for t in tweets], ["hello again"])
+        self.assertEqual(len(hashtags), 1)
+        self.assertEqual(len(likes), 1)
+        self.assertEqual([f.user_link for f in followers], ["new"])
+
+    def test_interrupted_fresh_import_is_rolled_back(self) -> None:
+        data = {
+            "account": [{"account": {"accountId": "42", "username": "example"}}],
+            "tweets": [
+                {
+                    "tweet": {
+                        "created_at": "2023-05-01T00:00:00.000Z",
+                        "id_str": "111",
+                        "id": "111",
+                        "full_text": "hello",
+                    }
+                }
+            ],
+        }
+
+        engine = self._new_engine()
+        with Session(engine) as session, mock.patch(
+            "birdapp.storage.importer.sync_tweet_fts_from_tweets",
+            side_effect=KeyboardInterrupt,
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                import_archive_data(data, session, fresh_import=True)
+
+        with Session(engine) as session:
+            self.assertEqual(self._count(session, Account), 0)
+            self.assertEqual(self._count(session, Tweet), 0)
+        index_names = {index["name"] for index in inspect(engine).get_indexes("tweet")}
+        self.assertIn("ix_tweet_account_id_created_at", index_names)
+
+    def test_init_db_recreates_missing_secondary_indexes(self) -> None:
+        engine = self._new_engine()
+        with engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_tweet_account_id_created_at"))
+
+        init_db(engine)
+
+        index_names = {index["name"] for index in inspect(engine).get_indexes("tweet")}
+        self.assertIn("ix_tweet_account_id_created_at", index_names)
+
+    def test_import_archive_data_workers_match_serial_import(self) -> None:
+        tweets = [
+            {
+                "tweet": {
+                    "created_at": "2023-05-01T00:00:00.000Z",
+                    "entities": {"hashtags": [{"text": f"Tag{index % 3}"}]},
+                    "id_str": str(100 + index),
+                    "id": str(100 + index),
+                    "full_text": f"tweet {index}",
+                }
+            }
+            for index in range(7)
+        ]
+        # A repeated id keeps its last occurrence regardless of which worker
+        # normalized it.
+        tweets.append({"tweet": dict(tweets[0]["tweet"], full_text="edited")})
+        data = {
+            "account": [{"account": {"accountId": "42", "username": "example"}}],
+            "tweets": tweets,
+        }
+
+        results = []
+        for workers in (1, 2):
+            engine = self._new_engine()
+            with Session(engine) as session, mock.patch(
+                "birdapp.storage.importer._NORMALIZE_CHUNK_SIZE", 3
+            ):
+                counts = import_archive_data(deepcopy(data), session, workers=workers)
+                rows = session.exec(select(col(Tweet.tweet_id), col(Tweet.full_text))).all()
+                hashtags = session.exec(select(col(TweetHashtag.tweet_id))).all()
+            results.append((counts, sorted(rows), sorted(hashtags)))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[1][0]["tweet"], 7)
+        self.assertIn(("100", "edited"), results[1][1])
+
+    def test_import_archive_streams_large_archive_by_section(self) -> None:
+        data = {
+            "upload-options": {"keepPrivate": False, "uploadLikes": True},
+            "account": [{"account": {"accountId": "42", "username": "example"}}],
+            "tweets": [
+                {
+                    "tweet": {
+                        "created_at": "2023-05-01T00:00:00.000Z",
+                        "entities": {"hashtags": [{"text": "Tag", "indices": ["0", "4"]}]},
+                        "id_str": "111",
+                        "id": "111",
+                        "full_text": "#Tag hello",
+                        "favorite_count": "1.5",
+                    }
+                }
+            ],
+            "like": [{"like": {"tweetId": "900", "fullText": "liked"}}],
+            "follower": [{"follower": {"accountId": "11", "userLink": "link"}}],
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            archive_path = Path(tmpdir) / "archive.json"
+            archive_path.write_text(json.dumps(data), encoding="utf-8")
+            with mock.patch("birdapp.storage.importer._STREAM_ARCHIVE_MIN_BYTES", 0):
+                streamed = import_archive(
+                    f"sqlite:///{Path(tmpdir) / 'streamed.db'}", path=archive_path
+                )
+                with Session(self._new_engine()) as session:
+                    from_path = import_archive_data(archive_path, session)
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            loaded = import_archive_data(deepcopy(data), session)
+
+        self.assertEqual(streamed, loaded)
+        self.assertEqual(from_path, loaded)
+        self.assertEqual(streamed["tweet"], 1)
+        self.assertEqual(streamed["tweet_hashtag"], 1)
+        self.assertEqual(streamed["upload_options"], 1)
+
+    def test_import_archive_data_ignores_entity_rows_already_stored(self) -> None:
+        data = {
+            "account": [
+                {
+                    "account": {
+                        "createdVia": "oauth:123",
+                        "username": "example",
+                        "accountId": "42",
+                        "createdAt": "2023-01-01T00:00:00.000Z",
+                        "accountDisplayName": "Example",
+                    }
+                }
+            ],
+            "tweets": [
+                {
+                    "tweet": {
+                        "created_at": "2023-05-01T00:00:00.000Z",
+                        "entities": {"hashtags": [{"text": "Tag", "indices": ["6", "10"]}]},
+                        "id": "111",
+                        "full_text": "hello #Tag",
+                    }
+                }
+            ],
+        }
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            # A stray entity row without its tweet is invisible to the
+            # per-batch prefetch; the UNIQUE constraint still drops the copy.
+            session.add(TweetHashtag(tweet_id="111", text="Tag", start_index=6, end_index=10))
+            session.commit()
+
+            import_archive_data(data, session)
+
+            hashtags = session.exec(select(TweetHashtag)).all()
+
+        self.assertEqual(len(hashtags), 1)
+
+    def test_import_archive_data_fresh_import_restores_secondary_indexes(self) -> None:
+        data = {
+            "account": [{"account": {"accountId": "42", "username": "example"}}],
+            "tweets": [{"tweet": {"id": "111", "full_text": "hello"}}],
+        }
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            import_archive_data(data, session, fresh_import=True)
+
+            indexes = {
+                row[1]
+                for row in session.connection().execute(text("PRAGMA index_list('tweet')"))
+            }
+            tweet = session.get(Tweet, "111")
+
+        self.assertIn("ix_tweet_account_id_created_at", indexes)
+        self.assertIn("ix_tweet_tweet_kind", indexes)
+        self.assertIsNotNone(tweet)
+
+    def test_import_archive_data_plain_reimport_keeps_community_metadata(self) -> None:
+        account = [{"account": {"accountId": "42", "username": "example"}}]
+        tweet = {
+            "created_at": "2023-05-01T00:00:00.000Z",
+            "id_str": "500",
+            "id": "500",
+            "full_text": "in a community",
+            "lang": "en",
+            "source": "web",
+        }
+        community_tweet = dict(
+            tweet, community_id="99", community_id_str="99", scopes={"followers": True}
+        )
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            import_archive_data(
+                {"account": account, "community-tweet": [{"tweet": community_tweet}]}, session
+            )
+            import_archive_data(
+                {"account": account, "tweets": [{"tweet": dict(tweet, full_text="edited")}]},
+                session,
+            )
+            stored = session.get(Tweet, "500")
+
+        self.assertIsNotNone(stored)
+        stored = cast(Tweet, stored)
+        self.assertEqual(stored.full_text, "edited")
+        self.assertEqual(stored.community_id, "99")
+        self.assertEqual(stored.community_id_str, "99")
+        self.assertEqual(stored.scopes, {"followers": True})
+
+    def test_init_db_adds_natural_key_constraints_to_legacy_entity_tables(self) -> None:
+        # Rebuild the schema as it was before the entity tables gained their
+        # natural-key UNIQUE constraints.
+        legacy_metadata = MetaData()
+        for table in SQLModel.metadata.sorted_tables:
+            legacy_table = table.to_metadata(legacy_metadata)
+            if legacy_table.name.startswith("tweet_"):
+                legacy_table.constraints -= {
+                    constraint
+                    for constraint in legacy_table.constraints
+                    if isinstance(constraint, UniqueConstraint)
+                }
+        engine = get_engine("sqlite:///:memory:")
+        legacy_metadata.create_all(engine)
+        self.assertEqual(inspect(engine).get_unique_constraints("tweet_hashtag"), [])
+
+        archive = {
+            "account": [{"account": {"accountId": "42", "username": "example"}}],
+            "tweets": [
+                {
+                    "tweet": {
+                        "created_at": "2023-05-01T00:00:00.000Z",
+                        "id_str": "500",
+                        "id": "500",
+                        "full_text": "#Tag",
+                        "lang": "en",
+                        "source": "web",
+                        "entities": {"hashtags": [{"text": "Tag", "indices": ["0", "4"]}]},
+                    }
+                }
+            ],
+        }
+        with Session(engine) as session:
+            import_archive_data(archive, session)
+            session.connection().execute(
+                text(
+                    "INSERT INTO tweet_hashtag (tweet_id, text, start_index, end_index) "
+                    "SELECT tweet_id, text, start_index, end_index FROM tweet_hashtag"
+                )
+            )
+            session.commit()
+            self.assertEqual(self._count(session, TweetHashtag), 2)
+
+        with self.assertLogs("birdapp.storage.db", level="WARNING") as logs:
+            init_db(engine)
+        init_db(engine)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Removed 1 duplicate tweet_hashtag rows", logs.output[0])
+        with engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql("PRAGMA user_version").scalar_one(), 1)
+        unique_indexes = {
+            index["name"] for index in inspect(engine).get_indexes("tweet_hashtag") if index["unique"]
+        }
+        self.assertEqual(unique_indexes, {"uq_tweet_hashtag_natural_key"})
+        with Session(engine) as session:
+            self.assertEqual(self._count(session, TweetHashtag), 1)
+            session.connection().execute(
+                text(
+                    "INSERT INTO tweet_hashtag (tweet_id, text, start_index, end_index) "
+                    "VALUES ('500', 'Tag', 0, 4) ON CONFLICT DO NOTHING"
+                )
+            )
+            session.commit()
+            self.assertEqual(self._count(session, TweetHashtag), 1)
+
+    def test_import_archive_data_counts_note_stored_under_other_owner_as_existing(self) -> None:
+        note = {
+            "noteTweet": {
+                "noteTweetId": "nt1",
+                "createdAt": "2023-01-01T00:00:00.000Z",
+                "updatedAt": "2023-01-01T00:00:00.000Z",
+                "lifecycle": {},
+                "core": {"text": "note"},
+            }
+        }
+
+        engine = self._new_engine()
+        with Session(engine) as session:
+            first = import_archive_data(
+                {
+                    "account": [{"account": {"accountId": "42", "username": "alice"}}],
+                    "note-tweet": [note],
+                },
+                session,
+            )
+            second = import_archive_data(
+                {
+                    "account": [{"account": {"accountId": "99", "username": "bob"}}],
+                    "note-tweet": [note],
+                },
+                session,
+            )
+            notes = self._count(session, NoteTweet)
+
+        self.assertEqual(first["note_tweet"], 1)
+        self.assertEqual(second["note_tweet"], 0)
+        self.assertEqual(notes, 1)
+
+    def test_legacy_archive_timestamps_match_strptime(self) -> None:
+        for value in (
+            "Thu Jan 22 21:04:29 +0000 2026",
+            "Wed Oct 10 20:19:24 -0530 2018",
+            "Mon Feb 29 00:00:01 +0130 2016",
+        ):
+            expected = datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y")
+            self.assertEqual(
+                _parse_archive_datetime(value), expected.astimezone(timezone.utc)
+            )
+        self.assertIsNone(_parse_archive_datetime("Thu Feb 30 21:04:29 +0000 2026"))
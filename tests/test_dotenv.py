@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from _dotenv import _DOTENV_RE, load_dotenv
+
+
+class TestLoadDotenv(unittest.TestCase):
+    def _load(self, contents: bytes) -> dict[str, str]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, ".env")
+            with open(path, "wb") as f:
+                f.write(contents)
+            with mock.patch.dict(os.environ, {"KEEP": "existing"}, clear=True):
+                load_dotenv(path)
+                return dict(os.environ)
+
+    def test_parses_assignments_and_keeps_existing_values(self) -> None:
+        env = self._load(
+            b"# comment\n"
+            b"X_CLIENT_ID=abc\n"
+            b"  X_CLIENT_SECRET = 'quoted secret'\n"
+            b'X_REDIRECT_URI="http://localhost:8080/callback"\n'
+            b"KEEP=from-file\n"
+        )
+
+        self.assertEqual(
+            env,
+            {
+                "KEEP": "existing",
+                "X_CLIENT_ID": "abc",
+                "X_CLIENT_SECRET": "quoted secret",
+                "X_REDIRECT_URI": "http://localhost:8080/callback",
+            },
+        )
+
+    def test_strips_crlf_line_endings(self) -> None:
+        contents = "X_CLIENT_ID=abc\r\nX_CLIENT_SECRET=\"secret\"\r\n"
+
+        env = self._load(contents.encode("utf-8"))
+        matched = {match.group(1): match.group(2) for match in _DOTENV_RE.finditer(contents)}
+
+        self.assertEqual(env["X_CLIENT_ID"], "abc")
+        self.assertEqual(env["X_CLIENT_SECRET"], "secret")
+        self.assertEqual(matched, {"X_CLIENT_ID": "abc", "X_CLIENT_SECRET": "secret"})
+
+    def test_missing_file_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            load_dotenv(os.path.join(tmpdir, ".env"))
+
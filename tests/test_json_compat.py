@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from birdapp import json_compat
+
+
+class TestJsonCompat(unittest.TestCase):
+    def test_dumps_is_compact_and_round_trips(self) -> None:
+        value = {"sizes": {"large": {"w": 1024, "h": 768}}, "text": "héllo"}
+
+        encoded = json_compat.dumps(value)
+
+        self.assertIsInstance(encoded, str)
+        self.assertNotIn(", ", encoded)
+        self.assertEqual(json.loads(encoded), value)
+        self.assertEqual(json_compat.loads(encoded), value)
+        self.assertEqual(json_compat.loads(encoded.encode("utf-8")), value)
+
+    def test_dumps_handles_integers_wider_than_64_bits(self) -> None:
+        value = {"id": 2**70}
+
+        self.assertEqual(json.loads(json_compat.dumps(value)), value)
+
+    def test_write_file_replaces_atomically_and_indents_on_request(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "token.json")
+            with open(path, "w") as f:
+                f.write("stale")
+
+            json_compat.write_file(path, {"access_token": "abc"}, indent=True)
+
+            with open(path, "r") as f:
+                contents = f.read()
+            self.assertEqual(json.loads(contents), {"access_token": "abc"})
+            self.assertIn('\n  "access_token"', contents)
+            self.assertTrue(contents.endswith("\n"))
+            self.assertEqual(os.listdir(tmpdir), ["token.json"])
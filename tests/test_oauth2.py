@@ -2,7 +2,10 @@ import base64
 import hashlib
 import json
 import os
+import socket
 import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch
 from urllib.parse import parse_qs, urlparse
@@ -55,7 +58,7 @@ class TestOAuth2(unittest.TestCase):
             "token_type": "bearer",
         }
 
-        with patch("birdapp.oauth2.requests.post", return_value=response) as post:
+        with patch.object(oauth2.get_session(), "post", return_value=response) as post:
             token = oauth2.exchange_code_for_token(
                 code="code123",
                 code_verifier="verifier123",
@@ -74,7 +77,7 @@ class TestOAuth2(unittest.TestCase):
         response.status_code = 401
         response.text = '{"error":"unauthorized_client","error_description":"Missing valid authorization header"}'
 
-        with patch("birdapp.oauth2.requests.post", return_value=response):
+        with patch.object(oauth2.get_session(), "post", return_value=response):
             with self.assertRaises(RuntimeError) as ctx:
                 oauth2.exchange_code_for_token(
                     code="code123",
@@ -92,7 +95,7 @@ class TestOAuth2(unittest.TestCase):
         response.ok = True
         response.json.return_value = {"data": {"id": "1", "username": "user"}}
 
-        with patch("birdapp.oauth2.requests.get", return_value=response) as get:
+        with patch.object(oauth2.get_session(), "get", return_value=response) as get:
             payload = oauth2.get_user_me(access_token="access-token")
             get.assert_called_once()
 
@@ -123,3 +126,33 @@ class TestOAuth2(unittest.TestCase):
             self.assertNotEqual(stored_token["access_token"], token["access_token"])
             self.assertNotEqual(stored_token["refresh_token"], token["refresh_token"])
 
+    def test_wait_for_oauth_callback_times_out_on_idle_connection(self) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        idle_sockets: list[socket.socket] = []
+
+        def connect_without_sending() -> None:
+            # Like a browser preconnect: open the socket, never send a request.
+            for _ in range(100):
+                try:
+                    idle_sockets.append(socket.create_connection(("127.0.0.1", port)))
+                    return
+                except OSError:
+                    time.sleep(0.01)
+
+        client = threading.Thread(target=connect_without_sending)
+        client.start()
+        started = time.monotonic()
+        try:
+            with self.assertRaises(RuntimeError):
+                oauth2.wait_for_oauth_callback(
+                    f"http://127.0.0.1:{port}/callback", timeout_seconds=1
+                )
+        finally:
+            client.join()
+            for idle_socket in idle_sockets:
+                idle_socket.close()
+
+        self.assertEqual(len(idle_sockets), 1)
+        self.assertLess(time.monotonic() - started, 10)
@@ -32,6 +32,34 @@ class TestProfiles(unittest.TestCase):
                     "bob-key",
                 )
 
+    def test_get_credentials_reads_config_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = {
+                "active_profile": "alice",
+                "profiles": {"alice": {"X_API_KEY": "alice-key"}},
+                "oauth2_app": {"X_OAUTH2_CLIENT_ID": "client"},
+            }
+            self._write_config(tmpdir, data)
+            with (
+                mock.patch.object(config_module.Path, "home", return_value=Path(tmpdir)),
+                mock.patch.object(
+                    config_module, "load_config", wraps=config_module.load_config
+                ) as load_config,
+            ):
+                values = config_module.get_credentials(
+                    ("X_API_KEY", "X_API_SECRET", "X_OAUTH2_CLIENT_ID")
+                )
+
+            self.assertEqual(
+                values,
+                {
+                    "X_API_KEY": "alice-key",
+                    "X_API_SECRET": None,
+                    "X_OAUTH2_CLIENT_ID": "client",
+                },
+            )
+            load_config.assert_called_once_with()
+
     def test_get_credential_legacy_config_still_works(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             data = {"X_API_KEY": "legacy-key", "X_USERNAME": "legacy-user"}
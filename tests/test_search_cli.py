@@ -13,31 +13,38 @@ from birdapp.storage.search import SearchOwner, SearchResult
 
 class TestSearchCli(unittest.TestCase):
     def test_search_cli_emits_json_results(self) -> None:
-        sample_results = [
-            SearchResult(
-                tweet_id="111",
-                created_at=datetime(2023, 5, 1, tzinfo=timezone.utc),
-                full_text="hello",
-                tweet_kind="tweet",
-                owner=SearchOwner(
-                    account_id="42",
-                    username="alice",
-                    account_display_name="Alice",
-                ),
-                rank=0.1,
-            )
-        ]
+        sample_payload = {
+            "count": 1,
+            "results": [
+                {
+                    "tweet_id": "111",
+                    "created_at": "2023-05-01T00:00:00.000Z",
+                    "full_text": "hello",
+                    "tweet_kind": "tweet",
+                    "owner": {
+                        "account_id": "42",
+                        "username": "alice",
+                        "account_display_name": "Alice",
+                    },
+                }
+            ],
+        }
         with (
             mock.patch.object(
                 sys,
                 "argv",
                 ["birdapp", "search", "hello", "--db", "sqlite:///:memory:", "--json"],
             ),
-            mock.patch("birdapp.main.search_tweets_in_db", return_value=sample_results),
+            mock.patch(
+                "birdapp.main.search_tweets_payload_in_db", return_value=sample_payload
+            ) as payload_mock,
+            mock.patch("birdapp.main.search_tweets_in_db") as results_mock,
             mock.patch("builtins.print") as print_mock,
         ):
             main_module.main()
 
+        payload_mock.assert_called_once()
+        results_mock.assert_not_called()
         printed = " ".join(" ".join(map(str, args)) for args, _ in print_mock.call_args_list)
         payload = json.loads(printed)
         self.assertEqual(payload["count"], 1)
@@ -43,3 +43,17 @@ class TestSessionProfiles(unittest.TestCase):
                 token = cast(dict[str, Any], token)
                 self.assertEqual(token["access_token"], "token-1")
                 self.assertIsNone(session_module.load_token("1", profile="bob"))
+
+    def test_token_refresh_lock_excludes_concurrent_holders(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch.object(session_module, "get_sessions_dir", return_value=tmpdir):
+                with session_module.token_refresh_lock("alice"):
+                    with self.assertRaises(TimeoutError):
+                        with session_module.token_refresh_lock("alice", timeout=0.1):
+                            pass
+                    # Other profiles refresh independently.
+                    with session_module.token_refresh_lock("bob", timeout=0.1):
+                        pass
+
+                with session_module.token_refresh_lock("alice", timeout=0.1):
+                    pass
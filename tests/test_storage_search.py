@@ -3,11 +3,19 @@ from __future__ import annotations
 import unittest
 from datetime import date, datetime, timezone
 
+from sqlalchemy import text
 from sqlmodel import Session
 
 from birdapp.storage.db import get_engine, init_db
 from birdapp.storage.importer import import_archive_data
-from birdapp.storage.search import SearchOwner, SearchResult, search_tweets
+from birdapp.storage.search import (
+    SearchOwner,
+    SearchResult,
+    ensure_tweet_fts,
+    search_results_payload,
+    search_tweets,
+    search_tweets_payload,
+)
 
 
 def _make_archive(owner_id: str, username: str, tweets: list[dict[str, str]]) -> dict[str, object]:
@@ -276,3 +284,70 @@ class TestStorageSearch(unittest.TestCase):
             results = search_tweets(session, query="world")
 
         self.assertEqual([result.tweet_id for result in results], ["111"])
+
+    def test_import_renumbers_legacy_fts_rows(self) -> None:
+        engine = get_engine("sqlite:///:memory:")
+        init_db(engine)
+        with Session(engine) as session:
+            ensure_tweet_fts(session)
+            session.connection().execute(
+                text(
+                    "INSERT INTO tweet_fts(tweet_id, account_id, full_text) "
+                    "VALUES('111', '42', 'stale text'), ('111', '42', 'hello world')"
+                )
+            )
+            import_archive_data(
+                _make_archive(
+                    "42",
+                    "alice",
+                    [
+                        {
+                            "id": "112",
+                            "full_text": "hello again",
+                            "created_at": "2023-05-01T00:00:00.000Z",
+                        }
+                    ],
+                ),
+                session,
+            )
+
+            rows = session.connection().execute(
+                text("SELECT rowid, tweet_id, full_text FROM tweet_fts ORDER BY rowid")
+            ).all()
+
+        self.assertEqual(
+            [tuple(row) for row in rows],
+            [(111, "111", "hello world"), (112, "112", "hello again")],
+        )
+
+    def test_search_payload_matches_result_payload(self) -> None:
+        engine = get_engine("sqlite:///:memory:")
+        init_db(engine)
+        with Session(engine) as session:
+            import_archive_data(
+                _make_archive(
+                    "42",
+                    "alice",
+                    [
+                        {
+                            "id": "111",
+                            "full_text": "hello world",
+                            "created_at": "2023-05-01T00:00:00.000Z",
+                        },
+                        {
+                            "id": "112",
+                            "full_text": "hello again",
+                            "created_at": "2023-05-02T00:00:00.000Z",
+                        },
+                    ],
+                ),
+                session,
+            )
+
+            payload = search_tweets_payload(session, query="hello", author="@alice")
+            expected = search_results_payload(
+                search_tweets(session, query="hello", author="@alice")
+            )
+
+        self.assertEqual(payload, expected)
+        self.assertEqual(payload["count"], 2)
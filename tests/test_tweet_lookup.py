@@ -0,0 +1,88 @@
+import json
+import time
+import unittest
+from typing import cast
+from unittest import mock
+
+
+def _lookup_response(ids: list[str], *, status_code: int = 200, headers: dict | None = None) -> mock.Mock:
+    response = mock.Mock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.reason = "OK" if response.ok else "Too Many Requests"
+    response.headers = headers or {}
+    payload = {
+        "data": [{"id": tweet_id, "text": f"tweet {tweet_id}", "author_id": "42"} for tweet_id in ids],
+        "includes": {"users": [{"id": "42", "username": "owner"}]},
+    }
+    response.content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+class TestGetTweetsByIdsMany(unittest.TestCase):
+    def test_chunks_requests_and_merges_in_input_order(self) -> None:
+        from birdapp import tweet as tweet_module
+
+        tweet_ids = [str(index) for index in range(250)]
+
+        def _get(*, url, params, auth):
+            ids = dict(params)["ids"].split(",")
+            self.assertLessEqual(len(ids), 100)
+            return _lookup_response(ids)
+
+        with (
+            mock.patch.object(tweet_module, "create_oauth1_auth", return_value=mock.sentinel.auth),
+            mock.patch.object(tweet_module._SESSION, "get", side_effect=_get) as get_mock,
+        ):
+            success, result = tweet_module.get_tweets_by_ids_many(tweet_ids, max_workers=3)
+
+        self.assertTrue(success)
+        self.assertIsInstance(result, dict)
+        result = cast(dict, result)
+        self.assertEqual(get_mock.call_count, 3)
+        self.assertEqual([tweet["id"] for tweet in result["data"]], tweet_ids)
+        self.assertEqual(result["includes"]["users"], [{"id": "42", "username": "owner"}])
+
+    def test_rate_limited_chunk_is_retried_after_reset(self) -> None:
+        from birdapp import tweet as tweet_module
+
+        responses = [
+            _lookup_response([], status_code=429, headers={"retry-after": "2"}),
+            _lookup_response(["1"]),
+        ]
+
+        with (
+            mock.patch.object(tweet_module, "create_oauth1_auth", return_value=mock.sentinel.auth),
+            mock.patch.object(tweet_module._SESSION, "get", side_effect=responses),
+            mock.patch.object(tweet_module.time, "sleep") as sleep_mock,
+        ):
+            success, result = tweet_module.get_tweets_by_ids_many(["1"])
+
+        self.assertTrue(success)
+        self.assertIsInstance(result, dict)
+        result = cast(dict, result)
+        sleep_mock.assert_called_once_with(2.0)
+        self.assertEqual([tweet["id"] for tweet in result["data"]], ["1"])
+
+    def test_far_future_rate_limit_reset_is_reported_instead_of_waited_out(self) -> None:
+        from birdapp import tweet as tweet_module
+
+        response = _lookup_response(
+            [], status_code=429, headers={"x-rate-limit-reset": str(time.time() + 3600)}
+        )
+
+        with (
+            mock.patch.object(tweet_module, "create_oauth1_auth", return_value=mock.sentinel.auth),
+            mock.patch.object(tweet_module._SESSION, "get", return_value=response) as get_mock,
+            mock.patch.object(tweet_module.time, "sleep") as sleep_mock,
+        ):
+            success, result = tweet_module.get_tweets_by_ids_many(["1"])
+
+        self.assertFalse(success)
+        self.assertIn("Rate limit exceeded", result)
+        sleep_mock.assert_not_called()
+        get_mock.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,7 +40,7 @@ class TestTweetOAuth2(unittest.TestCase):
                 mock.patch("birdapp.config.get_active_profile", return_value="WSPZoo"),
                 mock.patch("birdapp.session.get_sessions_dir", return_value=tmpdir),
                 mock.patch.object(tweet_module, "create_oauth1_auth", side_effect=_oauth1_should_not_be_used),
-                mock.patch.object(tweet_module.requests, "request", return_value=request_mock) as request,
+                mock.patch.object(tweet_module._SESSION, "request", return_value=request_mock) as request,
             ):
                 tweet_module.submit_tweet(text="hello from oauth2")
 
@@ -86,7 +86,7 @@ class TestTweetOAuth2(unittest.TestCase):
                     "create_oauth1_auth",
                     side_effect=AssertionError("OAuth1 should not be used for OAuth2 profile"),
                 ),
-                mock.patch.object(tweet_module.requests, "request", return_value=request_mock) as request,
+                mock.patch.object(tweet_module._SESSION, "request", return_value=request_mock) as request,
             ):
                 tweet_module.submit_tweet(text="hello from wspzoo")
 
@@ -100,7 +100,7 @@ class TestTweetOAuth2(unittest.TestCase):
                 mock.patch("birdapp.config.get_active_profile", return_value="christophcsmith"),
                 mock.patch("birdapp.session.get_sessions_dir", return_value=tmpdir),
                 mock.patch.object(tweet_module, "create_oauth1_auth", return_value=oauth1_auth),
-                mock.patch.object(tweet_module.requests, "request", return_value=request_mock) as request,
+                mock.patch.object(tweet_module._SESSION, "request", return_value=request_mock) as request,
             ):
                 tweet_module.submit_tweet(text="hello from christophcsmith")
 
@@ -147,7 +147,7 @@ class TestTweetOAuth2(unittest.TestCase):
                 ),
                 mock.patch("birdapp.oauth2.refresh_access_token", return_value={"access_token": "access-token-new", "token_type": "bearer"}) as refresh,
                 mock.patch("birdapp.session.save_token") as save_token,
-                mock.patch.object(tweet_module.requests, "request", side_effect=[response_401, response_ok]) as request,
+                mock.patch.object(tweet_module._SESSION, "request", side_effect=[response_401, response_ok]) as request,
                 mock.patch("birdapp.config.get_credential", side_effect=lambda key, **_: {"X_OAUTH2_CLIENT_ID": "client123", "X_OAUTH2_CLIENT_SECRET": None}.get(key)),
             ):
                 resp = tweet_module.submit_tweet(text="hello with refresh")
@@ -178,11 +178,14 @@ class TestTweetOAuth2(unittest.TestCase):
                 mock.patch.object(tweet_module, "create_oauth1_auth", side_effect=_oauth1_should_not_be_used),
                 mock.patch.object(
                     tweet_module.config_module,
-                    "get_credential",
-                    side_effect=lambda key, **_: {
-                        "X_OAUTH2_CLIENT_ID": "client123",
-                        "X_OAUTH2_REDIRECT_URI": "http://127.0.0.1:8080/callback",
-                    }.get(key),
+                    "get_credentials",
+                    side_effect=lambda keys, **_: {
+                        key: {
+                            "X_OAUTH2_CLIENT_ID": "client123",
+                            "X_OAUTH2_REDIRECT_URI": "http://127.0.0.1:8080/callback",
+                        }.get(key)
+                        for key in keys
+                    },
                 ),
             ):
                 with self.assertRaises(RuntimeError) as exc:
@@ -225,7 +228,7 @@ class TestTweetOAuth2(unittest.TestCase):
                     "create_oauth1_auth",
                     side_effect=AssertionError("OAuth1 should not be used for OAuth2 profile"),
                 ),
-                mock.patch.object(tweet_module.requests, "request", return_value=response_401),
+                mock.patch.object(tweet_module._SESSION, "request", return_value=response_401),
                 mock.patch("birdapp.oauth2.refresh_access_token") as refresh,
                 mock.patch("birdapp.session.save_token") as save_token,
                 mock.patch.object(
@@ -244,6 +247,43 @@ class TestTweetOAuth2(unittest.TestCase):
             save_token.assert_not_called()
             self.assertIn("auth login", str(exc.exception))
 
+    def test_oauth2_access_token_is_cached_until_tokens_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tokens_path = os.path.join(tmpdir, "tokens.json")
+
+            def write_token(access_token: str) -> None:
+                with open(tokens_path, "w") as f:
+                    json.dump(
+                        {"profiles": {"WSPZoo": {"123": {"access_token": access_token}}}},
+                        f,
+                    )
+
+            write_token("access-token-one")
+
+            from birdapp import session as session_module
+            from birdapp import tweet as tweet_module
+
+            with (
+                mock.patch("birdapp.config.get_active_profile", return_value="WSPZoo"),
+                mock.patch("birdapp.session.get_sessions_dir", return_value=tmpdir),
+                mock.patch.object(
+                    session_module,
+                    "load_any_oauth2_token",
+                    wraps=session_module.load_any_oauth2_token,
+                ) as load_token,
+            ):
+                first = tweet_module._load_oauth2_access_token()
+                second = tweet_module._load_oauth2_access_token()
+                self.assertEqual(load_token.call_count, 1)
+
+                write_token("access-token-second")
+                third = tweet_module._load_oauth2_access_token()
+
+            self.assertEqual(first, "access-token-one")
+            self.assertEqual(second, "access-token-one")
+            self.assertEqual(third, "access-token-second")
+            self.assertEqual(load_token.call_count, 2)
+
     def test_missing_tweet_write_scope_produces_helpful_message(self) -> None:
         from birdapp import tweet as tweet_module
 
@@ -251,10 +291,12 @@ class TestTweetOAuth2(unittest.TestCase):
         response_403.ok = False
         response_403.status_code = 403
         response_403.reason = "Forbidden"
-        response_403.json.return_value = {
-            "title": "Forbidden",
-            "detail": "Insufficient scope for this resource",
-        }
+        response_403.content = json.dumps(
+            {
+                "title": "Forbidden",
+                "detail": "Insufficient scope for this resource",
+            }
+        ).encode("utf-8")
 
         success, message = tweet_module.handle_tweet_response(response_403)
         self.assertFalse(success)